@@ -0,0 +1,361 @@
+"""Offline corpus benchmark for the doxxing detector.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_corpus [--update-baseline] [--tolerance 0.4] [--rounds 3]
+
+Each corpus case is scanned with find_doxxing_types and pushed through the full on_message path
+using in-memory fakes, so no Discord connection is needed. The report shows messages per second,
+p50/p99 latency and peak traced allocations per case.
+
+Each case is also scanned with the old multi-pass scanner in the same run, and throughput is
+gated as a multiple of that reference rather than in absolute messages per second, so the
+baseline carries across machines. The run exits non-zero when a case's multiple drops more than
+the tolerance below benchmarks/corpus_baseline.json; rerun with --update-baseline after a change
+that is meant to move the numbers.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import pathlib
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+
+import discord
+
+from benchmarks.bench_doxxing_detector import multi_pass_find_doxxing_types
+from doxxing_detector.doxxing_detector import LOG_CHANNEL_ID, DoxxingDetector
+
+
+BASELINE_PATH = pathlib.Path(__file__).with_name("corpus_baseline.json")
+MESSAGES_PER_CASE = 200
+TIMED_PASSES = 7
+
+CHAT_WORDS = (
+    "lol that was so funny yesterday did you see the stream chat was wild gg wp "
+    "anyone up for ranked tonight i think the patch broke everything again brb food"
+).split()
+COPYPASTA = (
+    "What the heck did you just say about my 3 favourite streamers, I'll have you know I "
+    "graduated top of my class after 12 years of watching VODs at 2x speed and I have over "
+    "300 confirmed clips. "
+)
+NEAR_MISSES = (
+    "the score was 3-2 and then 10-7 in overtime",
+    "meet at 12:30 or 1:45 tomorrow",
+    "chapter 1:02:33 has the best part",
+    "rated 9/10, would watch again",
+    "build 2024.11.05 fixed it",
+    "version 1.2.3.4 is out",
+    "IMG_20240101_123456.png",
+    "https://example.com/watch?v=123456789012",
+    "<t:1700000000:R>",
+    "i live on the 4th floor lol",
+    "the site is down again @ work",
+    "I have 555 points and 1234 coins",
+    "my 2 street fighters are better than your 3",
+    "order #5551234 shipped",
+    "steam code 4567-8910-1112",
+)
+# Anonymized detections: reserved example domains, 555 numbers and made-up streets.
+DETECTIONS = (
+    "reach me at jane.doe@example.com",
+    "call 555-013-4567 tonight",
+    "i live at 1234 Example Street",
+    "my number is (555) 013 4567",
+    "send it to 42 Sample Avenue",
+)
+
+
+class BenchMember(discord.Member):
+    """A guild member without gateway state; on_message only needs isinstance and a few fields."""
+
+    bot = False
+    id = 4242
+    roles = []
+    mention = "<@4242>"
+    top_role = 0
+    guild_permissions = types.SimpleNamespace(administrator=False)
+
+    def __init__(self):
+        pass
+
+    async def send(self, *args, **kwargs):
+        pass
+
+    async def timeout(self, *args, **kwargs):
+        pass
+
+
+async def discard(*args, **kwargs):
+    pass
+
+
+def referenced_message(message_id: int) -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        id=message_id,
+        content="forwarded clip with chat from last night",
+        embeds=[],
+        attachments=[],
+        message_snapshots=[],
+        reference=None,
+    )
+
+
+class BenchChannel:
+    id = 456
+    mention = "<#456>"
+
+    async def fetch_message(self, message_id):
+        return referenced_message(message_id)
+
+
+def fake_guild() -> types.SimpleNamespace:
+    log_channel = types.SimpleNamespace(id=LOG_CHANNEL_ID, send=discard)
+    return types.SimpleNamespace(
+        id=1,
+        me=types.SimpleNamespace(guild_permissions=types.SimpleNamespace(moderate_members=True), top_role=1),
+        get_channel=lambda channel_id: log_channel if channel_id == LOG_CHANNEL_ID else None,
+        text_channels=[],
+        threads=[],
+        channels=[],
+    )
+
+
+def chat_message(message_id: int, content: str, **fields) -> types.SimpleNamespace:
+    message = types.SimpleNamespace(
+        id=message_id,
+        guild=fake_guild(),
+        author=BenchMember(),
+        channel=BenchChannel(),
+        content=content,
+        embeds=[],
+        attachments=[],
+        message_snapshots=[],
+        reference=None,
+        delete=discard,
+    )
+    for name, value in fields.items():
+        setattr(message, name, value)
+    return message
+
+
+def embed_heavy_forward(message_id: int, rng: random.Random) -> types.SimpleNamespace:
+    embeds = [
+        {
+            "title": f"Clip {rng.randint(1, 999)}",
+            "description": " ".join(rng.choices(CHAT_WORDS, k=30)),
+            "fields": [{"name": "Views", "value": str(rng.randint(100, 99_999))}, {"name": "Length", "value": "1:42"}],
+            "footer": {"text": "posted 3 days ago"},
+        }
+        for _ in range(4)
+    ]
+    snapshot = types.SimpleNamespace(
+        message=types.SimpleNamespace(content=" ".join(rng.choices(CHAT_WORDS, k=12)), embeds=embeds, attachments=[])
+    )
+    return chat_message(
+        message_id,
+        "",
+        message_snapshots=[snapshot],
+        reference=types.SimpleNamespace(
+            type=discord.MessageReferenceType.forward,
+            channel_id=BenchChannel.id,
+            message_id=message_id + 1_000_000,
+            resolved=None,
+            cached_message=None,
+        ),
+    )
+
+
+def build_corpus(seed: int = 1234, size: int = MESSAGES_PER_CASE) -> dict[str, list]:
+    """Build the synthetic corpus; the same seed always yields the same messages."""
+    rng = random.Random(seed)
+    return {
+        "short chat": [
+            chat_message(index, " ".join(rng.choices(CHAT_WORDS, k=rng.randint(3, 15))))
+            for index in range(size)
+        ],
+        "long copypasta": [chat_message(index, COPYPASTA * rng.randint(5, 15)) for index in range(size)],
+        "embed-heavy forward": [embed_heavy_forward(index, rng) for index in range(size)],
+        "near miss": [chat_message(index, rng.choice(NEAR_MISSES)) for index in range(size)],
+        "detection": [chat_message(index, rng.choice(DETECTIONS)) for index in range(size)],
+    }
+
+
+def expected_detection(case: str) -> bool:
+    return case == "detection"
+
+
+def summarize(latencies: list[float], allocation_peak: int) -> dict:
+    total = sum(latencies)
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "messages_per_second": len(latencies) / total if total else 0.0,
+        "p50_us": quantiles[49] * 1_000_000,
+        "p99_us": quantiles[98] * 1_000_000,
+        "peak_kib": allocation_peak / 1024,
+    }
+
+
+def best_pass(run) -> list[float]:
+    """Latencies of the fastest of TIMED_PASSES runs, timed with the collector off as timeit does."""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return min((run() for _ in range(TIMED_PASSES)), key=sum)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def traced_peak(run) -> int:
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_find_doxxing_types(messages: list) -> tuple[list[float], int]:
+    texts = [DoxxingDetector.message_search_content(message) for message in messages]
+
+    def run() -> list[float]:
+        latencies = []
+        for text in texts:
+            started_at = time.perf_counter()
+            DoxxingDetector.find_doxxing_types(text)
+            latencies.append(time.perf_counter() - started_at)
+        return latencies
+
+    return best_pass(run), traced_peak(run)
+
+
+def bench_reference(messages: list) -> float:
+    """Messages per second of the multi-pass scanner on these messages, the same-run reference."""
+    texts = [DoxxingDetector.message_search_content(message) for message in messages]
+
+    def run() -> list[float]:
+        latencies = []
+        for text in texts:
+            started_at = time.perf_counter()
+            multi_pass_find_doxxing_types(text)
+            latencies.append(time.perf_counter() - started_at)
+        return latencies
+
+    return len(texts) / sum(best_pass(run))
+
+
+def bench_on_message(messages: list) -> tuple[list[float], int]:
+    bot = types.SimpleNamespace(
+        user=types.SimpleNamespace(id=1),
+        intents=types.SimpleNamespace(message_content=True),
+        get_channel=lambda channel_id: BenchChannel(),
+        get_guild=lambda guild_id: None,
+    )
+
+    async def run_pass() -> list[float]:
+        # A fresh cog per pass keeps reference fetches from being served by the previous pass's cache.
+        detector = DoxxingDetector(bot)
+        latencies = []
+        for message in messages:
+            started_at = time.perf_counter()
+            await detector.on_message(message)
+            latencies.append(time.perf_counter() - started_at)
+        detector.cog_unload()
+        return latencies
+
+    return best_pass(lambda: asyncio.run(run_pass())), traced_peak(lambda: asyncio.run(run_pass()))
+
+
+def check_verdicts(corpus: dict[str, list]) -> list[str]:
+    failures = []
+    for case, messages in corpus.items():
+        for message in messages:
+            detected = bool(DoxxingDetector.find_doxxing_types(DoxxingDetector.message_search_content(message)))
+            if detected != expected_detection(case):
+                failures.append(f"{case}: unexpected verdict for {message.content[:60]!r}")
+    return failures
+
+
+def run_suite(corpus: dict[str, list], rounds: int = 1) -> dict[str, dict]:
+    """Summarize every stage and case, keeping each case's fastest of several rounds.
+
+    Rounds are spread over the whole suite, so a slow stretch on a shared machine only costs the
+    cases it overlapped in one round.
+    """
+    results = {}
+    for _ in range(rounds):
+        for case, messages in corpus.items():
+            reference = bench_reference(messages)
+            for stage, bench in (("find_doxxing_types", bench_find_doxxing_types), ("on_message", bench_on_message)):
+                name = f"{stage} / {case}"
+                result = summarize(*bench(messages))
+                result["reference_multiple"] = result["messages_per_second"] / reference
+                if name not in results or result["reference_multiple"] > results[name]["reference_multiple"]:
+                    results[name] = result
+    return results
+
+
+def regressions(results: dict[str, dict], baseline: dict[str, float], tolerance: float) -> list[str]:
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        floor = expected * (1 - tolerance)
+        if result["reference_multiple"] < floor:
+            failures.append(
+                f"{name}: {result['reference_multiple']:.3f}x the multi-pass reference is below {floor:.3f}x "
+                f"(baseline {expected:.3f}x, tolerance {tolerance:.0%})"
+            )
+    return failures
+
+
+def print_report(results: dict[str, dict]):
+    print(f"{'case':<40} {'msgs/s':>10} {'x ref':>8} {'p50 us':>9} {'p99 us':>9} {'peak KiB':>9}")
+    for name, result in results.items():
+        print(
+            f"{name:<40} {result['messages_per_second']:>10.0f} {result['reference_multiple']:>8.3f} "
+            f"{result['p50_us']:>9.1f} {result['p99_us']:>9.1f} {result['peak_kib']:>9.1f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.4, help="allowed drop in reference multiple, as a fraction")
+    parser.add_argument("--rounds", type=int, default=3, help="suite repetitions; each case keeps its best round")
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus()
+    verdict_failures = check_verdicts(corpus)
+    results = run_suite(corpus, args.rounds)
+    print_report(results)
+
+    if args.update_baseline:
+        baseline = {name: round(result["reference_multiple"], 4) for name, result in results.items()}
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\nWrote baseline to {args.baseline}")
+        return 1 if verdict_failures else 0
+
+    failures = verdict_failures
+    if args.baseline.exists():
+        failures += regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
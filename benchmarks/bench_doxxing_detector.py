@@ -0,0 +1,372 @@
+"""Microbenchmarks for the doxxing detector text scanner and OCR input path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_doxxing_detector [screenshot directory]
+
+The optional directory is the local screenshot regression corpus for the OCR preprocessing check;
+it defaults to the sample image shipped with the plugin.
+"""
+
+import asyncio
+import pathlib
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import types
+import zlib
+
+from doxxing_detector import doxxing_detector as doxxing_detector_module
+from doxxing_detector.doxxing_detector import (
+    ADDRESS_RE,
+    AMBIGUOUS_ADDRESS_RE,
+    CONVERSATIONAL_ADDRESS_WORDS,
+    DISCORD_TIMESTAMP_RE,
+    DOXXING_TYPES,
+    EMAIL_RE,
+    IMAGE_ATTACHMENT_EXTENSIONS,
+    GAME_SCORE_RE,
+    HOUSING_DESCRIPTION_WORDS,
+    PHONE_RE,
+    RATING_RE,
+    VIDEO_TIMESTAMP_RE,
+    TESSERACT_CONFIG,
+    DoxxingDetector,
+    MessageView,
+    TesseractOcrEngine,
+)
+
+
+SCANNER_CORPUS = {
+    "short chat": "lol that was so funny yesterday did you see the stream",
+    "chat with numbers": (
+        "Can someone please tell me that once you hit 30 everything clicks into place "
+        "and it finally starts to feel like your life isn't 2 seconds away"
+    ),
+    "video chapters": (
+        "https://www.youtube.com/watch?v=mXEJNFzoVaY&t=3s\n"
+        + "Funny 0:57 Pit LCU Park intro still of Tina in SP dancing together.\n" * 8
+    ),
+    "phone number": "call me at 555-123-4567 after the stream",
+    "email": "email me at person@example.com if you want the clip",
+    "long copypasta": "lorem ipsum dolor sit amet consectetur adipiscing elit " * 40,
+    "chat with durations": "i have 4 hours left and 2 more episodes of the show to watch " * 4,
+}
+
+
+def multi_pass_find_doxxing_types(content: str) -> list[str]:
+    """The previous substitute-then-search pipeline, kept as the comparison baseline."""
+    matches = []
+    searchable_content = DISCORD_TIMESTAMP_RE.sub(" ", content)
+    searchable_content = VIDEO_TIMESTAMP_RE.sub(" ", searchable_content)
+    searchable_content = GAME_SCORE_RE.sub(" ", searchable_content)
+    searchable_content = RATING_RE.sub(" ", searchable_content)
+    searchable_content = DoxxingDetector.strip_http_urls(searchable_content)
+    phone_searchable_content = DoxxingDetector.strip_file_tokens(searchable_content)
+
+    if EMAIL_RE.search(searchable_content):
+        matches.append("email")
+    if PHONE_RE.search(phone_searchable_content):
+        matches.append("phone number")
+    if DoxxingDetector.has_address(searchable_content):
+        matches.append("address")
+    return matches
+
+
+def microseconds_per_call(function, content: str, number: int) -> float:
+    return min(timeit.repeat(lambda: function(content), number=number, repeat=5)) / number * 1_000_000
+
+
+def bench_scanner(number: int = 2000):
+    print(f"{'case':<20} {'chars':>6} {'multi-pass us':>14} {'single-pass us':>15} {'speedup':>8}")
+    for name, content in SCANNER_CORPUS.items():
+        multi_pass = microseconds_per_call(multi_pass_find_doxxing_types, content, number)
+        single_pass = microseconds_per_call(DoxxingDetector.find_doxxing_types, content, number)
+        print(f"{name:<20} {len(content):>6} {multi_pass:>14.2f} {single_pass:>15.2f} {multi_pass / single_pass:>7.1f}x")
+
+
+def scan_without_prefilter(content: str) -> list[str]:
+    return DoxxingDetector.find_doxxing_types(content, DOXXING_TYPES)
+
+
+def bench_prefilter(number: int = 2000):
+    print(f"{'case':<20} {'possible types':<30} {'full scan us':>13} {'prefiltered us':>15}")
+    full_total = prefiltered_total = 0.0
+    for name, content in SCANNER_CORPUS.items():
+        possible_types = ", ".join(DoxxingDetector.possible_doxxing_types(content)) or "-"
+        full_scan = microseconds_per_call(scan_without_prefilter, content, number)
+        prefiltered = microseconds_per_call(DoxxingDetector.find_doxxing_types, content, number)
+        full_total += full_scan
+        prefiltered_total += prefiltered
+        print(f"{name:<20} {possible_types:<30} {full_scan:>13.2f} {prefiltered:>15.2f}")
+    print(f"{'whole corpus':<20} {'':<30} {full_total:>13.2f} {prefiltered_total:>15.2f}")
+
+
+ADDRESS_CORPUS = {
+    "stats dump": "went 12 kills 3 deaths 450 damage and 18 assists in 27 minutes, " * 20,
+    "durations": "i have 4 hours left and 2 more episodes of the show to watch " * 20,
+    "housing ads": "2 bed apt, 1 bath unit, 3 bedroom unit, studio apt with 2 room unit " * 15,
+    "late address": "the 3 things i got in 2 days were 4 cards " * 25 + "send it to 1234 Example Street",
+    "early address": "send it to 1234 Example Street " + "the 3 things i got in 2 days were 4 cards " * 25,
+}
+
+
+def eager_is_likely_address_match(match) -> bool:
+    """The previous per-word strip and membership loop, kept as the comparison baseline."""
+    street_words = [
+        word.strip(" .'-").lower()
+        for word in match.group("street_name").split()
+        if word.strip(" .'-")
+    ]
+    if any(word in CONVERSATIONAL_ADDRESS_WORDS for word in street_words):
+        return False
+    if match.group("suffix").lower() in {"apartment", "apt", "unit"} and all(
+        word in HOUSING_DESCRIPTION_WORDS for word in street_words
+    ):
+        return False
+    return True
+
+
+def eager_has_address(content: str) -> bool:
+    """The previous has_address, which listed every candidate before checking any of them."""
+    address_matches = ADDRESS_RE.finditer(content)
+    ambiguous_matches = AMBIGUOUS_ADDRESS_RE.finditer(content)
+    return any(eager_is_likely_address_match(match) for match in [*address_matches, *ambiguous_matches])
+
+
+def unbounded_find_doxxing_types(content: str) -> list[str]:
+    """find_doxxing_types trying the address regexes on every number, as before the suffix word bound."""
+    last_suffix_word_start = DoxxingDetector.last_suffix_word_start
+    DoxxingDetector.last_suffix_word_start = staticmethod(len)
+    try:
+        return DoxxingDetector.find_doxxing_types(content)
+    finally:
+        DoxxingDetector.last_suffix_word_start = last_suffix_word_start
+
+
+def bench_address(number: int = 500):
+    print(
+        f"{'case':<16} {'chars':>6} {'eager has_address us':>21} {'lazy us':>8} "
+        f"{'unbounded scan us':>18} {'bounded us':>11} {'speedup':>8}"
+    )
+    for name, content in ADDRESS_CORPUS.items():
+        if eager_has_address(content) != DoxxingDetector.has_address(content):
+            raise AssertionError(f"{name}: address verdicts differ")
+        if unbounded_find_doxxing_types(content) != DoxxingDetector.find_doxxing_types(content):
+            raise AssertionError(f"{name}: scan verdicts differ")
+        eager = microseconds_per_call(eager_has_address, content, number)
+        lazy = microseconds_per_call(DoxxingDetector.has_address, content, number)
+        unbounded = microseconds_per_call(unbounded_find_doxxing_types, content, number)
+        bounded = microseconds_per_call(DoxxingDetector.find_doxxing_types, content, number)
+        print(
+            f"{name:<16} {len(content):>6} {eager:>21.2f} {lazy:>8.2f} "
+            f"{unbounded:>18.2f} {bounded:>11.2f} {unbounded / bounded:>7.1f}x"
+        )
+
+
+def forward_message() -> types.SimpleNamespace:
+    snapshot = types.SimpleNamespace(
+        message=types.SimpleNamespace(
+            content="look at this",
+            embeds=[{"title": "clip", "description": "stream highlights"}],
+            attachments=[],
+        )
+    )
+    return types.SimpleNamespace(
+        id=123,
+        content="",
+        embeds=[],
+        attachments=[],
+        message_snapshots=[snapshot, snapshot],
+        reference=types.SimpleNamespace(type=1, channel_id=456, message_id=789, resolved=None, cached_message=None),
+    )
+
+
+def on_message_predicates(message) -> None:
+    """The message predicates one on_message call evaluates before and during its scan."""
+    DoxxingDetector.is_forward_message(message)
+    DoxxingDetector.is_reference_like_message(message)
+    DoxxingDetector.message_search_parts(message)
+    DoxxingDetector.may_need_current_message_refetch(message)
+    DoxxingDetector.needs_reference_fetch_for_scan(message)
+    DoxxingDetector.forward_snapshots(message)
+    DoxxingDetector.is_forward_message(message)
+
+
+def bench_message_view(number: int = 20000):
+    message = forward_message()
+    per_call = microseconds_per_call(on_message_predicates, message, number)
+    one_view = microseconds_per_call(lambda raw: on_message_predicates(MessageView(raw)), message, number)
+    print(f"{'forward predicates':<20} {'per-call us':>12} {'one view us':>12} {'speedup':>8}")
+    print(f"{'':<20} {per_call:>12.2f} {one_view:>12.2f} {per_call / one_view:>7.1f}x")
+
+
+# Simulated Discord round trips for the moderation actions, in seconds.
+ACTION_LATENCIES = {"delete": 0.12, "dm": 0.25, "timeout": 0.15}
+
+
+def simulated_detection(visible_until: dict) -> types.SimpleNamespace:
+    async def request(name):
+        await asyncio.sleep(ACTION_LATENCIES[name])
+        if name == "delete":
+            visible_until["delete"] = time.perf_counter()
+
+    author = types.SimpleNamespace(
+        bot=False,
+        send=lambda content: request("dm"),
+        timeout=lambda until, reason=None: request("timeout"),
+        guild_permissions=types.SimpleNamespace(administrator=False),
+        roles=[],
+        top_role=1,
+    )
+    me = types.SimpleNamespace(guild_permissions=types.SimpleNamespace(moderate_members=True), top_role=2)
+    return types.SimpleNamespace(author=author, guild=types.SimpleNamespace(me=me), delete=lambda: request("delete"))
+
+
+async def sequential_detection_actions(detector: DoxxingDetector, message) -> None:
+    """The previous order: DM, then delete, then timeout, one after another."""
+    await detector.dm_detected_author(message)
+    await detector.delete_message(message)
+    await detector.timeout_detected_author(message)
+
+
+def bench_detection_actions():
+    detector = DoxxingDetector(types.SimpleNamespace(user=types.SimpleNamespace(id=1)))
+
+    async def measure(actions) -> tuple[float, float]:
+        visible_until = {}
+        started_at = time.perf_counter()
+        await actions(detector, simulated_detection(visible_until))
+        return visible_until["delete"] - started_at, time.perf_counter() - started_at
+
+    sequential = asyncio.run(measure(sequential_detection_actions))
+    delete_first = asyncio.run(measure(lambda detector, message: detector.apply_detection_actions(message)))
+    detector.cog_unload()
+    print(f"{'actions':<20} {'PII visible ms':>15} {'all done ms':>12}")
+    for name, (visible, total) in (("sequential", sequential), ("delete first", delete_first)):
+        print(f"{name:<20} {visible * 1000:>15.0f} {total * 1000:>12.0f}")
+
+
+def png_bytes(width: int, height: int) -> bytes:
+    """Encode a white grayscale PNG without needing Pillow."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + b"\xff" * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def temp_file_image_to_text(engine: TesseractOcrEngine, image_bytes: bytes) -> str:
+    """The previous path: write the attachment to a .png temp file and OCR the file."""
+    with tempfile.NamedTemporaryFile(suffix=".png") as image_file:
+        image_file.write(image_bytes)
+        image_file.flush()
+        completed = subprocess.run(
+            [engine.tesseract_cmd, image_file.name, "stdout", *TESSERACT_CONFIG.split()],
+            capture_output=True,
+            check=True,
+        )
+    return completed.stdout.decode("utf-8", errors="replace")
+
+
+def milliseconds_per_image(function, engine, image_bytes: bytes, number: int) -> float:
+    timings = []
+    for _ in range(number):
+        started_at = time.perf_counter()
+        function(engine, image_bytes)
+        timings.append(time.perf_counter() - started_at)
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def bench_ocr_input(number: int = 20):
+    engine = TesseractOcrEngine(types.SimpleNamespace(pytesseract=types.SimpleNamespace(tesseract_cmd=None)))
+    try:
+        temp_file_image_to_text(engine, png_bytes(8, 8))
+    except (OSError, subprocess.CalledProcessError) as exc:
+        print(f"OCR input benchmark skipped: tesseract unavailable ({exc})")
+        return
+
+    print(f"{'image':<12} {'bytes':>8} {'temp file ms':>13} {'stdin ms':>9}")
+    for width, height in ((64, 32), (800, 600), (1920, 1080)):
+        image_bytes = png_bytes(width, height)
+        temp_file = milliseconds_per_image(temp_file_image_to_text, engine, image_bytes, number)
+        in_memory = milliseconds_per_image(TesseractOcrEngine.image_to_text, engine, image_bytes, number)
+        size = f"{width}x{height}"
+        print(f"{size:<12} {len(image_bytes):>8} {temp_file:>13.1f} {in_memory:>9.1f}")
+
+
+DEFAULT_SCREENSHOT_CORPUS = pathlib.Path(__file__).resolve().parent.parent / "doxxing_detector" / "doxxing_test.png"
+
+
+def screenshot_paths(corpus: pathlib.Path) -> list[pathlib.Path]:
+    if corpus.is_file():
+        return [corpus]
+    return sorted(path for path in corpus.iterdir() if path.suffix.lower() in IMAGE_ATTACHMENT_EXTENSIONS)
+
+
+def ocr_without_preprocessing(engine, image_bytes: bytes) -> tuple[str, dict]:
+    preprocess_enabled = doxxing_detector_module.OCR_PREPROCESS_ENABLED
+    doxxing_detector_module.OCR_PREPROCESS_ENABLED = False
+    try:
+        return DoxxingDetector.engine_image_text(engine, image_bytes)
+    finally:
+        doxxing_detector_module.OCR_PREPROCESS_ENABLED = preprocess_enabled
+
+
+def bench_ocr_preprocessing(corpus: pathlib.Path = DEFAULT_SCREENSHOT_CORPUS):
+    """Compare OCR latency and detections with and without preprocessing on a screenshot corpus."""
+    try:
+        engine = DoxxingDetector.load_ocr_engine()
+        engine.image_to_text(png_bytes(8, 8))
+    except Exception as exc:
+        engine = None
+        print(f"OCR comparison skipped, only preprocessing cost is measured: {type(exc).__name__}: {exc}")
+
+    print(f"{'image':<28} {'MP before':>9} {'MP after':>8} {'prep ms':>8} {'raw OCR ms':>11} {'OCR ms':>7} {'same types':>10}")
+    changed = 0
+    for path in screenshot_paths(corpus):
+        image_bytes = path.read_bytes()
+        started_at = time.perf_counter()
+        _image, pixels_before, pixels_after = DoxxingDetector.preprocess_ocr_image(image_bytes)
+        preprocess_ms = (time.perf_counter() - started_at) * 1000
+        raw_ms = ocr_ms = "-"
+        same_types = "-"
+        if engine is not None:
+            raw_text, raw_timings = ocr_without_preprocessing(engine, image_bytes)
+            text, timings = DoxxingDetector.engine_image_text(engine, image_bytes)
+            raw_ms = f"{raw_timings['ocr_seconds'] * 1000:.0f}"
+            ocr_ms = f"{(timings['ocr_seconds'] + timings['preprocess_seconds']) * 1000:.0f}"
+            same = DoxxingDetector.find_doxxing_types(raw_text) == DoxxingDetector.find_doxxing_types(text)
+            changed += not same
+            same_types = "yes" if same else "NO"
+        print(
+            f"{path.name[:28]:<28} {pixels_before / 1e6:>9.2f} {pixels_after / 1e6:>8.2f} {preprocess_ms:>8.1f} "
+            f"{raw_ms:>11} {ocr_ms:>7} {same_types:>10}"
+        )
+    if engine is not None:
+        print(f"images whose detected types changed: {changed}")
+
+
+if __name__ == "__main__":
+    bench_scanner()
+    print()
+    bench_prefilter()
+    print()
+    bench_address()
+    print()
+    bench_message_view()
+    print()
+    bench_detection_actions()
+    print()
+    bench_ocr_input()
+    print()
+    bench_ocr_preprocessing(pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SCREENSHOT_CORPUS)
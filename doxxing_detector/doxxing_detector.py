@@ -1,14 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import concurrent.futures
+import contextlib
 import datetime
+import functools
+import hashlib
+import heapq
 import importlib.metadata as importlib_metadata
+import io
+import itertools
+import math
 import os
 import re
 import shutil
+import string
+import subprocess
 import sys
-import tempfile
+import threading
+import time
 import discord
 from discord.ext import commands
 
@@ -54,9 +65,11 @@ PHONE_RE = re.compile(
 )
 
 DISCORD_TIMESTAMP_RE = re.compile(r"<t:\d{1,12}(?::[A-Za-z])?>")
-VIDEO_TIMESTAMP_RE = re.compile(r"(?<!\w)\d{1,2}:\d{2}(?::\d{2})?(?!\w)")
-GAME_SCORE_RE = re.compile(r"\b\d+\s*v(?:s\.?|ersus)?\s*\d+\b", re.IGNORECASE)
-RATING_RE = re.compile(r"(?<!\w)\d{1,2}/10(?!\w)")
+# These start with a digit and check the character before it afterwards. re skips ahead to a
+# digit quickly, which it cannot do for a pattern that opens with a lookbehind or \b.
+VIDEO_TIMESTAMP_RE = re.compile(r"\d(?<!\w\d)\d?:\d{2}(?::\d{2})?(?!\w)")
+GAME_SCORE_RE = re.compile(r"\d(?<!\w\d)\d*\s*v(?:s\.?|ersus)?\s*\d+\b", re.IGNORECASE)
+RATING_RE = re.compile(r"\d(?<!\w\d)\d?/10(?!\w)")
 HTTP_URL_RE = re.compile(r"\bhttps?://[^\s<>()]+", re.IGNORECASE)
 FILE_TOKEN_RE = re.compile(
     r"(?<!\S)"
@@ -65,6 +78,28 @@ FILE_TOKEN_RE = re.compile(
     r"(?!\S)",
     re.IGNORECASE,
 )
+# Neutral tokens are blanked in this order before PII is searched, and the order decides which of
+# two overlapping tokens wins. Each pattern is paired with a check on the ASCII shape of the text
+# (see ASCII_NEUTRAL_SHAPE_BYTES) that it cannot match without, so most passes are skipped.
+# URLs go last, through strip_http_urls.
+NEUTRAL_TOKEN_BLANKING_ORDER = (
+    (DISCORD_TIMESTAMP_RE, re.compile(rb"<t:0")),
+    (VIDEO_TIMESTAMP_RE, re.compile(rb"0:00")),
+    (GAME_SCORE_RE, re.compile(rb"0 *v")),
+    (RATING_RE, re.compile(rb"0/00")),
+)
+# Turns ASCII digits into "0", whitespace into a space and letters lowercase.
+ASCII_NEUTRAL_SHAPE_BYTES = bytes(
+    ord("0") if char.isdigit() else ord(" ") if char.isspace() else ord(char.lower())
+    for char in map(chr, range(128))
+) + bytes(range(128, 256))
+# Every PII candidate starts at one of these characters, so the scanner only runs
+# the full patterns at trigger positions instead of every offset.
+# The [0-9] variant is only used for ASCII text; it scans faster than \d.
+SCAN_TRIGGER_PATTERN = r"[{digit}(+@](?<!\w[{digit}(+])"
+SCAN_TRIGGER_RE = re.compile(SCAN_TRIGGER_PATTERN.format(digit=r"\d"))
+ASCII_SCAN_TRIGGER_RE = re.compile(SCAN_TRIGGER_PATTERN.format(digit="0-9"))
+EMAIL_LOCAL_PART_CHARS = frozenset(string.ascii_letters + string.digits + "._%+-")
 IMAGE_ATTACHMENT_EXTENSIONS = {
     ".avif",
     ".bmp",
@@ -91,12 +126,83 @@ IMAGE_ATTACHMENT_CONTENT_TYPES = {
 }
 MAX_OCR_ATTACHMENT_BYTES = 8 * 1024 * 1024
 OCR_TIMEOUT_SECONDS = 45
+TESSERACT_CONFIG = "--psm 6"
+# "thread" or "process". pytesseract runs tesseract as a subprocess, so threads already overlap;
+# the process backend also moves image decoding and engine setup off the bot process.
+OCR_EXECUTOR_BACKEND = "thread"
+OCR_WORKER_COUNT = os.cpu_count() or 1
+# Images OCR'd at once for one message, so a single large post cannot take every OCR worker.
+MAX_CONCURRENT_MESSAGE_OCR = 4
+# Images waiting for OCR across all messages. Queued jobs hold no image bytes; attachments are only
+# read once a job starts. When the queue is full, new images are shed: "skip" scans the message
+# without them, and "delete and review" removes an otherwise clean message and logs it for review.
+OCR_QUEUE_MAX_JOBS = 64
+OCR_QUEUE_SHED_POLICY = "skip"
+OCR_SHED_LOG_INTERVAL_SECONDS = 60
+# Accounts younger than this have their images OCR'd ahead of everyone else's.
+OCR_PRIORITY_NEW_ACCOUNT_AGE = datetime.timedelta(days=7)
+REFERENCE_CACHE_MAX_ENTRIES = 2048
+REFERENCE_CACHE_TTL_SECONDS = 15 * 60
+MESSAGE_REFETCH_CACHE_MAX_ENTRIES = 2048
+MESSAGE_REFETCH_CACHE_TTL_SECONDS = 15 * 60
+# Forbidden and NotFound answers are remembered per channel or message for a minute; other HTTP
+# errors may be transient, so those only back off for a few seconds.
+FAILED_FETCH_CACHE_MAX_ENTRIES = 4096
+FAILED_FETCH_CACHE_TTL_SECONDS = 60
+FAILED_FETCH_BACKOFF_SECONDS = 5
+UNKNOWN_CHANNEL_ERROR_CODE = 10003
+MESSAGE_LOCATION_INDEX_MAX_PER_GUILD = 20_000
+# Scanned messages whose content hash and verdict are kept, so an edit is only rescanned when it
+# changes what the detector reads.
+EDIT_SCAN_RECORD_MAX_ENTRIES = 20_000
+REFERENCE_SWEEP_CONCURRENCY = 4
+REFERENCE_SWEEP_TIME_BUDGET_SECONDS = 10
+OCR_CACHE_MAX_ENTRIES = 4096
+OCR_CACHE_MAX_BYTES = 8 * 1024 * 1024
+OCR_CACHE_TTL_SECONDS = 24 * 60 * 60
+# Images are shrunk to about this many pixels before OCR (a 300 DPI half page); screenshots have
+# no meaningful DPI, so the cap is in pixels. It is above a typical phone screenshot (about 3 MP),
+# so those are OCRed at full size and only camera photos and desktop or 4K captures are shrunk.
+# Shrinking stops at the minimum scale so that long scrolling screenshots keep legible text.
+OCR_PREPROCESS_ENABLED = True
+OCR_MAX_IMAGE_PIXELS = 4_000_000
+OCR_MIN_IMAGE_SCALE = 0.5
+# Cropping to the edge-dense region trims flat borders and backgrounds, but can cut faint text.
+OCR_CROP_TO_TEXT_REGION = False
+OCR_CROP_EDGE_THRESHOLD = 48
+OCR_CROP_SAMPLE_FACTOR = 4
+OCR_CROP_MARGIN_PIXELS = 16
+# Perceptual hashing reuses OCR text for re-encoded or resized copies of an image. It is off by
+# default because two different screenshots of the same layout can share a hash.
+OCR_PERCEPTUAL_HASH_ENABLED = False
+OCR_PERCEPTUAL_HASH_SIZE = 16
+# Stage latencies go into fixed log-scale buckets, each about 19% wide, from 10 us to about two
+# minutes; slower samples share the last bucket. The histograms stay the same size however many
+# messages are timed.
+LATENCY_HISTOGRAM_MIN_SECONDS = 1e-5
+LATENCY_HISTOGRAM_BUCKETS_PER_DOUBLING = 4
+LATENCY_HISTOGRAM_BUCKETS = 96
+LATENCY_STAGES = (
+    "regex scan",
+    "ocr and fetch",
+    "ocr queue wait",
+    "ocr preprocess",
+    "tesseract",
+    "message refetch",
+    "reference fetch",
+    "delete",
+    "dm",
+    "timeout",
+    "scan total",
+)
+SCAN_RATE_WINDOW_MINUTES = 5
 
 STREET_SUFFIX_RE = (
     r"street|st|avenue|ave|road|rd|drive|dr|lane|ln|court|ct|circle|cir|"
     r"boulevard|blvd|terrace|ter|trail|trl|parkway|pkwy|"
     r"highway|hwy|route|rte|apartment|apt|suite|ste|unit"
 )
+AMBIGUOUS_STREET_SUFFIX_RE = r"way|place|pl"
 
 ADDRESS_RE = re.compile(
     r"(?<!\w)"
@@ -112,13 +218,34 @@ AMBIGUOUS_ADDRESS_RE = re.compile(
     r"(?<!\w)"
     r"(?P<number>\d{2,6})\s+"
     r"(?P<street_name>(?:[A-Z0-9][A-Z0-9'.-]*\s+){1,2})"
-    r"(?P<suffix>way|place|pl)"
+    rf"(?P<suffix>{AMBIGUOUS_STREET_SUFFIX_RE})"
     r"(?:\.|\b)"
     r"(?:\s+(?:apt|apartment|suite|ste|unit|#)\s*[A-Z0-9-]+)?",
     re.IGNORECASE,
 )
 
-CONVERSATIONAL_ADDRESS_WORDS = {
+ADDRESS_SUFFIX_WORDS = frozenset(
+    f"{STREET_SUFFIX_RE}|{AMBIGUOUS_STREET_SUFFIX_RE}".split("|")
+)
+DIGIT_RE = re.compile(r"\d")
+# Deleting every other byte leaves only the ASCII digits, so the digit count is one C-level pass.
+ASCII_NON_DIGIT_BYTES = bytes(byte for byte in range(256) if not ord("0") <= byte <= ord("9"))
+# Lowercases ASCII letters and turns every other ASCII non-word byte into a space, so split()
+# yields the words of ASCII text at their original offsets. bytes.translate is a table lookup per
+# byte, several times faster than str.translate with a mapping or a regex split.
+ASCII_FOLDED_WORD_BYTES = bytes(
+    ord(char.lower()) if char.isalnum() or char == "_" else ord(" ") for char in map(chr, range(128))
+) + bytes(range(128, 256))
+ADDRESS_SUFFIX_WORD_BYTES = frozenset(word.encode() for word in ADDRESS_SUFFIX_WORDS)
+# Text that ends in an address has its last suffix word near the end, so that tail is tokenized
+# first and the rest of the text only when the tail holds none.
+ADDRESS_SUFFIX_TAIL_CHARS = 64
+# The rest of the text is read this far into the tail, so a suffix word cut by the tail is whole.
+ADDRESS_SUFFIX_WORD_MAX_CHARS = max(map(len, ADDRESS_SUFFIX_WORDS))
+DOXXING_TYPES = ("email", "phone number", "address")
+MIN_PHONE_DIGITS = 10
+
+CONVERSATIONAL_ADDRESS_WORDS = frozenset({
     "a",
     "an",
     "and",
@@ -174,9 +301,9 @@ CONVERSATIONAL_ADDRESS_WORDS = {
     "which",
     "you",
     "your",
-}
+})
 
-HOUSING_DESCRIPTION_WORDS = {
+HOUSING_DESCRIPTION_WORDS = frozenset({
     "bath",
     "bathroom",
     "bed",
@@ -184,18 +311,605 @@ HOUSING_DESCRIPTION_WORDS = {
     "br",
     "room",
     "studio",
-}
+})
+HOUSING_SUFFIX_WORDS = frozenset({"apartment", "apt", "unit"})
+# Street name words with their leading and trailing punctuation already trimmed; the name only
+# contains letters, digits, whitespace and '.-, so this matches word.strip(" .'-") for each word.
+ADDRESS_STREET_WORD_RE = re.compile(r"[^\s.'-]+(?:[.'-]+[^\s.'-]+)*")
 
 
 class TesseractOcrEngine:
+    name = "pytesseract (tesseract subprocess per image)"
+
     def __init__(self, pytesseract_module):
         self.pytesseract = pytesseract_module
         tesseract_cmd = shutil.which("tesseract") or "/app/.apt/usr/bin/tesseract"
+        self.tesseract_cmd = tesseract_cmd
         if tesseract_cmd:
             self.pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
-    def image_to_text(self, image_path: str) -> str:
-        return self.pytesseract.image_to_string(image_path, config="--psm 6") or ""
+    def image_to_text(self, image) -> str:
+        """Read text from encoded image bytes, a decoded Pillow image, or an image path."""
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return self.image_bytes_to_text(bytes(image))
+        if hasattr(image, "save"):
+            image_buffer = io.BytesIO()
+            image.save(image_buffer, format="PNG")
+            return self.image_bytes_to_text(image_buffer.getvalue())
+        return self.pytesseract.image_to_string(image, config=TESSERACT_CONFIG) or ""
+
+    def image_bytes_to_text(self, image_bytes: bytes) -> str:
+        # tesseract reads the encoded image from stdin and detects its format, so nothing is
+        # written to disk and JPEG/WebP data is no longer labelled as PNG.
+        completed = subprocess.run(
+            [self.tesseract_cmd, "stdin", "stdout", *TESSERACT_CONFIG.split()],
+            input=image_bytes,
+            capture_output=True,
+            timeout=OCR_TIMEOUT_SECONDS,
+        )
+        if completed.returncode != 0:
+            error_text = completed.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"tesseract exited with status {completed.returncode}: {error_text}")
+        return completed.stdout.decode("utf-8", errors="replace")
+
+
+class TesserocrOcrEngine:
+    """OCR through long-lived tesserocr API handles, one per worker thread.
+
+    Creating a handle loads the language data, which is most of the cost of a small screenshot,
+    so each handle is kept and reused. Handles are not thread-safe, hence one per thread.
+    """
+
+    name = "tesserocr (persistent Tesseract API per worker)"
+
+    def __init__(self, tesserocr_module, image_module):
+        self.tesserocr = tesserocr_module
+        self.Image = image_module
+        self._local = threading.local()
+        # Build this thread's handle now so missing language data fails the load, not each image.
+        self.api()
+
+    def api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = self.tesserocr.PyTessBaseAPI(psm=self.tesserocr.PSM.SINGLE_BLOCK)
+            self._local.api = api
+        return api
+
+    def image_to_text(self, image) -> str:
+        """Read text from encoded image bytes, a decoded Pillow image, or an image path."""
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            with self.Image.open(io.BytesIO(image)) as decoded_image:
+                return self.decoded_image_to_text(decoded_image)
+        if isinstance(image, str):
+            with self.Image.open(image) as decoded_image:
+                return self.decoded_image_to_text(decoded_image)
+        return self.decoded_image_to_text(image)
+
+    def decoded_image_to_text(self, image) -> str:
+        api = self.api()
+        api.SetImage(image)
+        try:
+            return api.GetUTF8Text() or ""
+        finally:
+            api.Clear()
+
+
+class LatencyHistogram:
+    """Latency samples counted into fixed log-scale buckets, for approximate percentiles."""
+
+    def __init__(self):
+        self.counts = [0] * LATENCY_HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float):
+        if seconds <= LATENCY_HISTOGRAM_MIN_SECONDS:
+            index = 0
+        else:
+            index = math.ceil(math.log2(seconds / LATENCY_HISTOGRAM_MIN_SECONDS) * LATENCY_HISTOGRAM_BUCKETS_PER_DOUBLING)
+            index = min(index, LATENCY_HISTOGRAM_BUCKETS - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        return LATENCY_HISTOGRAM_MIN_SECONDS * 2 ** (index / LATENCY_HISTOGRAM_BUCKETS_PER_DOUBLING)
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the given percentile, capped at the slowest sample."""
+        if not self.count:
+            return 0.0
+        target = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if bucket_count and seen >= target:
+                if index == LATENCY_HISTOGRAM_BUCKETS - 1:
+                    return self.max_seconds
+                return min(self.bucket_upper_bound(index), self.max_seconds)
+        return self.max_seconds
+
+    def stats_text(self) -> str:
+        if not self.count:
+            return "no samples"
+
+        def milliseconds(seconds: float) -> str:
+            return f"{seconds * 1000:.1f}ms"
+
+        return (
+            f"p50 {milliseconds(self.percentile(50))}, p95 {milliseconds(self.percentile(95))}, "
+            f"p99 {milliseconds(self.percentile(99))}, max {milliseconds(self.max_seconds)} ({self.count} samples)"
+        )
+
+
+class OcrExecutor:
+    """Run OCR jobs on a thread or process pool, timing queue wait apart from run time.
+
+    Jobs wait for a free worker slot before they are submitted, so the pool never holds a backlog
+    and the caller's timeout only covers the work itself.
+    """
+
+    def __init__(self, backend: str = OCR_EXECUTOR_BACKEND, max_workers: int = OCR_WORKER_COUNT):
+        if backend == "thread":
+            self.pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="doxxing-ocr",
+            )
+        elif backend == "process":
+            self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            raise ValueError(f"Unknown OCR executor backend: {backend!r}")
+        self.backend = backend
+        self.max_workers = max_workers
+        self.jobs = 0
+        self.queued_jobs = 0
+        self.queue_wait_seconds = 0.0
+        self.run_seconds = 0.0
+        self._slots = asyncio.Semaphore(max_workers)
+
+    async def run(self, func, *args, timeout: float | None = OCR_TIMEOUT_SECONDS):
+        loop = asyncio.get_running_loop()
+        queued_at = time.monotonic()
+        self.queued_jobs += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued_jobs -= 1
+        started_at = time.monotonic()
+        self.queue_wait_seconds += started_at - queued_at
+
+        try:
+            future = self.pool.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # A timed-out job keeps its worker busy, so the slot is only freed once the job really ends.
+        future.add_done_callback(lambda _future: self.release_slot(loop))
+        self.jobs += 1
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), timeout=timeout)
+        finally:
+            self.run_seconds += time.monotonic() - started_at
+
+    def release_slot(self, loop: asyncio.AbstractEventLoop):
+        try:
+            loop.call_soon_threadsafe(self._slots.release)
+        except RuntimeError:
+            pass
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats_text(self) -> str:
+        average_wait = self.queue_wait_seconds / self.jobs if self.jobs else 0.0
+        average_run = self.run_seconds / self.jobs if self.jobs else 0.0
+        return (
+            f"{self.backend} x {self.max_workers} workers, {self.jobs} jobs, {self.queued_jobs} waiting, "
+            f"queue wait {average_wait:.2f}s avg, run {average_run:.2f}s avg"
+        )
+
+
+class OcrQueueFull(Exception):
+    """Raised when an OCR job is shed because the OCR queue is full."""
+
+
+class OcrFailed(Exception):
+    """Raised when OCR of an image failed; the failure has already been logged."""
+
+
+class OcrJobQueue:
+    """Bounded priority queue of OCR jobs, run a fixed number at a time.
+
+    Jobs run lowest (priority, size) first, so urgent senders and small images go ahead of large
+    ones. A full queue rejects new jobs with OcrQueueFull instead of growing.
+    """
+
+    def __init__(self, max_jobs: int = OCR_QUEUE_MAX_JOBS, concurrency: int = OCR_WORKER_COUNT):
+        self.max_jobs = max_jobs
+        self.concurrency = concurrency
+        self.queued = 0
+        self.running = 0
+        self.jobs = 0
+        self.shed = 0
+        self.wait_latency = LatencyHistogram()
+        self._heap = []
+        self._sequence = itertools.count()
+
+    async def run(self, priority: int, size: int, call):
+        if self.queued >= self.max_jobs:
+            self.shed += 1
+            raise OcrQueueFull(f"OCR queue is full ({self.max_jobs} images waiting).")
+
+        job = {"future": asyncio.get_running_loop().create_future(), "started": False, "queued_at": time.perf_counter()}
+        heapq.heappush(self._heap, (priority, size, next(self._sequence), call, job))
+        self.queued += 1
+        self.dispatch()
+        try:
+            return await job["future"]
+        except asyncio.CancelledError:
+            if not job["started"]:
+                self.queued -= 1
+            raise
+
+    def dispatch(self):
+        while self.running < self.concurrency and self._heap:
+            *_key, call, job = heapq.heappop(self._heap)
+            if job["future"].done():
+                continue
+            job["started"] = True
+            self.queued -= 1
+            self.running += 1
+            self.jobs += 1
+            self.wait_latency.record(time.perf_counter() - job["queued_at"])
+            task = asyncio.ensure_future(call())
+            task.add_done_callback(functools.partial(self.finish, job["future"]))
+            job["future"].add_done_callback(lambda future, task=task: task.cancel() if future.cancelled() else None)
+
+    def finish(self, future: asyncio.Future, task: asyncio.Task):
+        self.running -= 1
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            if not future.done():
+                future.set_exception(task.exception())
+        elif not future.done():
+            future.set_result(task.result())
+        self.dispatch()
+
+    def stats_text(self) -> str:
+        return (
+            f"{self.queued}/{self.max_jobs} waiting, {self.running}/{self.concurrency} running, "
+            f"{self.jobs} started, {self.shed} shed"
+        )
+
+
+class MessageLocationIndex:
+    """Channel ids of recently seen messages, evicting the oldest message id per guild."""
+
+    def __init__(self, max_messages_per_guild: int = MESSAGE_LOCATION_INDEX_MAX_PER_GUILD):
+        self.max_messages_per_guild = max_messages_per_guild
+        self.hits = 0
+        self.misses = 0
+        self._channel_ids = {}
+
+    def __len__(self) -> int:
+        return sum(len(channel_ids) for channel_ids in self._channel_ids.values())
+
+    def add(self, guild_id, message_id, channel_id):
+        if not guild_id or not message_id or not channel_id:
+            return
+        # Insertion order is eviction order, and a removed id leaves nothing behind to evict later.
+        channel_ids = self._channel_ids.setdefault(guild_id, collections.OrderedDict())
+        if message_id not in channel_ids and len(channel_ids) >= self.max_messages_per_guild:
+            channel_ids.popitem(last=False)
+        channel_ids[message_id] = channel_id
+
+    def remove(self, guild_id, message_id):
+        self._channel_ids.get(guild_id, {}).pop(message_id, None)
+
+    def channel_id(self, guild_id, message_id):
+        channel_id = self._channel_ids.get(guild_id, {}).get(message_id)
+        if channel_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return channel_id
+
+    def stats_text(self) -> str:
+        lookups = self.hits + self.misses
+        hit_ratio = self.hits / lookups if lookups else 0.0
+        return (
+            f"{len(self)} messages in {len(self._channel_ids)} guilds "
+            f"(max {self.max_messages_per_guild} per guild), hit ratio {hit_ratio:.1%} "
+            f"({self.hits} hits, {self.misses} misses)"
+        )
+
+
+class SingleFlight:
+    """Let concurrent callers with the same key share one in-flight call.
+
+    The shared task is cancelled only once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key, call):
+        flight = self._flights.get(key)
+        if flight is None:
+            self.calls += 1
+            flight = {"task": asyncio.ensure_future(call()), "waiters": 0}
+            self._flights[key] = flight
+            flight["task"].add_done_callback(lambda _task: self._flights.pop(key, None))
+        else:
+            self.shared += 1
+
+        flight["waiters"] += 1
+        try:
+            return await asyncio.shield(flight["task"])
+        except asyncio.CancelledError:
+            if flight["waiters"] == 1 and not flight["task"].done():
+                flight["task"].cancel()
+            raise
+        finally:
+            flight["waiters"] -= 1
+
+    def stats_text(self) -> str:
+        return f"{self.calls} started, {self.shared} joined an in-flight call, {len(self)} in flight"
+
+
+class KeyedLock:
+    """One asyncio lock per key, dropped once nobody holds or waits for it. A None key is not locked."""
+
+    def __init__(self):
+        self._locks = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key):
+        if key is None:
+            yield
+            return
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = {"lock": asyncio.Lock(), "users": 0}
+            self._locks[key] = entry
+        entry["users"] += 1
+        try:
+            async with entry["lock"]:
+                yield
+        finally:
+            entry["users"] -= 1
+            if not entry["users"]:
+                del self._locks[key]
+
+
+class ScanResult:
+    """The searchable parts of one message, where each came from, and what the scan matched."""
+
+    def __init__(self, parts=()):
+        self.parts = list(parts)
+        self.match_types = []
+        self.timings = {}
+        self.shed_images = 0
+
+    @property
+    def content(self) -> str:
+        return "\n".join(text for _source, text in self.parts)
+
+    @property
+    def sources(self) -> list[str]:
+        return list(dict.fromkeys(source for source, _text in self.parts))
+
+
+class MessageView:
+    """A message read once per event, with the forward and reference predicates cached.
+
+    Other attributes fall through to the wrapped message, so a view can stand in for it.
+    """
+
+    __slots__ = (
+        "message",
+        "id",
+        "content",
+        "reference",
+        "reference_message_id",
+        "reference_channel_id",
+        "_embeds",
+        "_attachments",
+        "_snapshots",
+        "_is_forward_reference",
+        "_needs_reference_fetch",
+        "_may_need_current_message_refetch",
+    )
+
+    def __init__(self, message):
+        field_value = DoxxingDetector.field_value
+        self.message = message
+        self.id = field_value(message, "id")
+        self.content = field_value(message, "content", "")
+        self.reference = field_value(message, "reference")
+        self.reference_message_id = field_value(self.reference, "message_id")
+        self.reference_channel_id = field_value(self.reference, "channel_id")
+        self._embeds = None
+        self._attachments = None
+        self._snapshots = None
+        self._is_forward_reference = None
+        self._needs_reference_fetch = None
+        self._may_need_current_message_refetch = None
+
+    @classmethod
+    def of(cls, message) -> "MessageView":
+        return message if isinstance(message, cls) else cls(message)
+
+    def __getattr__(self, name):
+        if name == "message":
+            raise AttributeError(name)
+        return DoxxingDetector.field_value_or_raise(self.message, name)
+
+    @property
+    def embeds(self) -> list:
+        if self._embeds is None:
+            self._embeds = DoxxingDetector.sequence_field(self.message, "embeds")
+        return self._embeds
+
+    @property
+    def attachments(self) -> list:
+        if self._attachments is None:
+            self._attachments = DoxxingDetector.sequence_field(self.message, "attachments")
+        return self._attachments
+
+    @property
+    def snapshots(self) -> list:
+        if self._snapshots is None:
+            self._snapshots = [
+                DoxxingDetector.snapshot_payload(snapshot)
+                for snapshot in DoxxingDetector.sequence_field(self.message, "message_snapshots")
+            ]
+        return self._snapshots
+
+    @property
+    def is_forward(self) -> bool:
+        return bool(self.snapshots)
+
+    @property
+    def is_forward_reference(self) -> bool:
+        if self._is_forward_reference is None:
+            self._is_forward_reference = self.reference is not None and DoxxingDetector.is_forward_reference(
+                self.reference
+            )
+        return self._is_forward_reference
+
+    @property
+    def has_visible_content(self) -> bool:
+        return bool(self.content or self.embeds or self.attachments)
+
+    @property
+    def has_message_id_without_reference_channel(self) -> bool:
+        return bool(self.reference is not None and self.reference_message_id and not self.reference_channel_id)
+
+    @property
+    def needs_reference_fetch(self) -> bool:
+        if self._needs_reference_fetch is None:
+            if self.reference is None or not self.reference_message_id or not self.reference_channel_id:
+                self._needs_reference_fetch = False
+            else:
+                self._needs_reference_fetch = self.is_forward_reference or (
+                    not self.has_visible_content and not self.snapshots
+                )
+        return self._needs_reference_fetch
+
+    @property
+    def may_need_current_message_refetch(self) -> bool:
+        if self._may_need_current_message_refetch is None:
+            self._may_need_current_message_refetch = bool(
+                self.id and self.reference is not None and not self.snapshots
+            )
+        return self._may_need_current_message_refetch
+
+    @property
+    def is_reference_like(self) -> bool:
+        return (
+            self.may_need_current_message_refetch
+            or self.has_message_id_without_reference_channel
+            or self.needs_reference_fetch
+        )
+
+
+class BoundedCache:
+    """LRU cache bounded by entry count and optional value size, with a TTL."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float | None = None,
+        max_bytes: int | None = None,
+        sizeof=None,
+        clock=time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.clock = clock
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, _size, value = entry
+        if expires_at is not None and expires_at <= self.clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl_seconds: float | None = None):
+        if key in self._entries:
+            self._remove(key)
+
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = self.clock() + ttl_seconds if ttl_seconds is not None else None
+        self._entries[key] = (expires_at, size, value)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def discard(self, key) -> bool:
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def _remove(self, key):
+        _expires_at, size, _value = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats_text(self) -> str:
+        size_text = f"{len(self)}/{self.max_entries} entries"
+        if self.max_bytes is not None:
+            size_text += f", {self.total_bytes}/{self.max_bytes} bytes"
+        return (
+            f"{size_text}, hit ratio {self.hit_ratio():.1%} "
+            f"({self.hits} hits, {self.misses} misses, {self.evictions} evicted, {self.expirations} expired)"
+        )
 
 
 class DoxxingDetector(commands.Cog):
@@ -207,16 +921,47 @@ class DoxxingDetector(commands.Cog):
         self._warned_empty_forward_snapshot_content = False
         self._warned_missing_ocr_dependencies = False
         self._warned_ocr_failure = False
-        self._reference_fetch_cache = {}
-        self._message_refetch_cache = {}
-        self._attachment_ocr_cache = {}
+        self._reference_fetch_cache = BoundedCache(
+            REFERENCE_CACHE_MAX_ENTRIES,
+            ttl_seconds=REFERENCE_CACHE_TTL_SECONDS,
+        )
+        self._message_refetch_cache = BoundedCache(
+            MESSAGE_REFETCH_CACHE_MAX_ENTRIES,
+            ttl_seconds=MESSAGE_REFETCH_CACHE_TTL_SECONDS,
+        )
+        self._failed_fetch_cache = BoundedCache(
+            FAILED_FETCH_CACHE_MAX_ENTRIES,
+            ttl_seconds=FAILED_FETCH_CACHE_TTL_SECONDS,
+        )
+        self._attachment_ocr_cache = BoundedCache(
+            OCR_CACHE_MAX_ENTRIES,
+            ttl_seconds=OCR_CACHE_TTL_SECONDS,
+            max_bytes=OCR_CACHE_MAX_BYTES,
+            sizeof=lambda text: len(text.encode("utf-8")),
+        )
+        self._message_locations = MessageLocationIndex()
+        self._edit_scan_records = BoundedCache(EDIT_SCAN_RECORD_MAX_ENTRIES)
+        # Held while a message is scanned and acted on, so an edit waits for the scan in flight.
+        self._message_scans = KeyedLock()
+        self._edit_scan_counts = collections.Counter()
+        self._reference_flights = SingleFlight()
+        self._ocr_flights = SingleFlight()
         self._ocr_engine = None
         self._ocr_engine_lock = asyncio.Lock()
-        self._ocr_executor = concurrent.futures.ThreadPoolExecutor(
-            max_workers=1,
-            thread_name_prefix="doxxing-ocr",
-        )
+        self._ocr_executor = OcrExecutor()
+        self._ocr_queue = OcrJobQueue()
+        self._ocr_shed_since_log = 0
+        self._ocr_shed_logged_at = None
         self._ocr_dependency_error = None
+        self._prefilter_counts = collections.Counter()
+        self._ocr_counts = collections.Counter()
+        self._ocr_timings = collections.Counter()
+        self._reference_sweep_counts = collections.Counter()
+        self._avoided_fetch_counts = collections.Counter()
+        self._stage_latencies = collections.defaultdict(LatencyHistogram)
+        self._stage_latencies["ocr queue wait"] = self._ocr_queue.wait_latency
+        self._scans_per_minute = collections.deque(maxlen=SCAN_RATE_WINDOW_MINUTES + 1)
+        self._started_at = time.monotonic()
 
     def get_log_channel(self, guild: discord.Guild | None = None):
         log_channel = guild.get_channel(LOG_CHANNEL_ID) if guild is not None else None
@@ -225,7 +970,7 @@ class DoxxingDetector(commands.Cog):
         return log_channel
 
     def cog_unload(self):
-        self._ocr_executor.shutdown(wait=False, cancel_futures=True)
+        self._ocr_executor.shutdown()
 
     async def send_log_embed(self, embed: discord.Embed, guild: discord.Guild | None = None):
         log_channel = self.get_log_channel(guild)
@@ -337,9 +1082,16 @@ class DoxxingDetector(commands.Cog):
             await ctx.send("Attach an image to this command to run OCR.")
             return
 
-        text = await self.ocr_attachment_text(image_attachment, ctx.guild)
+        try:
+            text = await self.ocr_attachment_text(image_attachment, ctx.guild)
+        except OcrQueueFull:
+            await ctx.send("The OCR queue is full. Try again in a minute.")
+            return
+        except OcrFailed:
+            await ctx.send("OCR failed. Check the doxxing detector warning log.")
+            return
         if not text:
-            await ctx.send("No OCR text was found, or OCR failed. Check the doxxing detector warning log.")
+            await ctx.send("No OCR text was found.")
             return
 
         await self.send_text_chunks(ctx, text)
@@ -350,6 +1102,22 @@ class DoxxingDetector(commands.Cog):
         """Report OCR dependency status for the running bot process."""
         await self.send_text_chunks(ctx, self.ocr_dependency_report())
 
+    @commands.command(name="doxstats")
+    @commands.has_permissions(manage_messages=True)
+    async def dox_stats(self, ctx: commands.Context):
+        """Report doxxing detector scan counts, stage latencies and cache usage."""
+        await self.send_text_chunks(
+            ctx,
+            "\n\n".join(
+                [
+                    self.scan_stats_report(),
+                    self.latency_stats_report(),
+                    self.cache_stats_report(),
+                    self.ocr_stats_report(),
+                ]
+            ),
+        )
+
     @commands.command(name="killbot", aliases=["shutdownbot"])
     @commands.has_permissions(administrator=True)
     async def kill_bot(self, ctx: commands.Context):
@@ -426,53 +1194,29 @@ class DoxxingDetector(commands.Cog):
     def has_message_content_intent(self) -> bool:
         return getattr(getattr(self.bot, "intents", None), "message_content", True)
 
-    @classmethod
-    def is_forward_message(cls, message: discord.Message) -> bool:
-        return bool(cls.forward_snapshots(message))
+    @staticmethod
+    def is_forward_message(message: discord.Message) -> bool:
+        return MessageView.of(message).is_forward
 
-    @classmethod
-    def has_visible_message_content(cls, message: discord.Message) -> bool:
-        return bool(
-            cls.field_value(message, "content", "")
-            or cls.sequence_field(message, "embeds")
-            or cls.sequence_field(message, "attachments")
-        )
+    @staticmethod
+    def has_visible_message_content(message: discord.Message) -> bool:
+        return MessageView.of(message).has_visible_content
 
-    @classmethod
-    def needs_reference_fetch_for_scan(cls, message: discord.Message) -> bool:
-        reference = cls.field_value(message, "reference")
-        if reference is None or not cls.field_value(reference, "message_id"):
-            return False
-        if not cls.field_value(reference, "channel_id"):
-            return False
-        if cls.is_forward_reference(reference):
-            return True
-        return not cls.has_visible_message_content(message) and not cls.forward_snapshots(message)
+    @staticmethod
+    def needs_reference_fetch_for_scan(message: discord.Message) -> bool:
+        return MessageView.of(message).needs_reference_fetch
 
-    @classmethod
-    def has_message_id_without_reference_channel(cls, message: discord.Message) -> bool:
-        reference = cls.field_value(message, "reference")
-        return bool(
-            reference is not None
-            and cls.field_value(reference, "message_id")
-            and not cls.field_value(reference, "channel_id")
-        )
+    @staticmethod
+    def has_message_id_without_reference_channel(message: discord.Message) -> bool:
+        return MessageView.of(message).has_message_id_without_reference_channel
 
-    @classmethod
-    def may_need_current_message_refetch(cls, message: discord.Message) -> bool:
-        return bool(
-            cls.field_value(message, "id")
-            and cls.field_value(message, "reference") is not None
-            and not cls.forward_snapshots(message)
-        )
+    @staticmethod
+    def may_need_current_message_refetch(message: discord.Message) -> bool:
+        return MessageView.of(message).may_need_current_message_refetch
 
-    @classmethod
-    def is_reference_like_message(cls, message: discord.Message) -> bool:
-        return (
-            cls.may_need_current_message_refetch(message)
-            or cls.has_message_id_without_reference_channel(message)
-            or cls.needs_reference_fetch_for_scan(message)
-        )
+    @staticmethod
+    def is_reference_like_message(message: discord.Message) -> bool:
+        return MessageView.of(message).is_reference_like
 
     @classmethod
     def forward_reference_channel_id(cls, message: discord.Message) -> int | None:
@@ -486,10 +1230,10 @@ class DoxxingDetector(commands.Cog):
         except (TypeError, ValueError):
             return None
 
-    @classmethod
-    def has_forward_like_reference(cls, message: discord.Message) -> bool:
-        reference = cls.field_value(message, "reference")
-        return bool(reference is not None and cls.field_value(reference, "message_id"))
+    @staticmethod
+    def has_forward_like_reference(message: discord.Message) -> bool:
+        view = MessageView.of(message)
+        return bool(view.reference is not None and view.reference_message_id)
 
     @classmethod
     def guild_has_channel_id(cls, guild, channel_id: int) -> bool:
@@ -504,6 +1248,83 @@ class DoxxingDetector(commands.Cog):
         channels.extend(cls.sequence_field(guild, "channels"))
         return any(cls.field_value(channel, "id") == channel_id for channel in channels)
 
+    def guild_channel(self, guild, channel_id: int):
+        for method_name in ["get_channel_or_thread", "get_channel", "get_thread"]:
+            method = getattr(guild, method_name, None)
+            channel = method(channel_id) if method is not None else None
+            if channel is not None:
+                return channel
+        return self.bot.get_channel(channel_id)
+
+    def index_message_location(self, message: discord.Message):
+        self._message_locations.add(
+            self.field_value(self.field_value(message, "guild"), "id"),
+            self.field_value(message, "id"),
+            self.field_value(self.field_value(message, "channel"), "id"),
+        )
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        self._message_locations.add(payload.guild_id, payload.message_id, payload.channel_id)
+        self.invalidate_message_caches(payload.guild_id, payload.channel_id, payload.message_id)
+        await self.scan_edited_message(payload)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        self._message_locations.remove(payload.guild_id, payload.message_id)
+        self.invalidate_message_caches(payload.guild_id, payload.channel_id, payload.message_id)
+        self._edit_scan_records.discard(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        for message_id in payload.message_ids:
+            self._message_locations.remove(payload.guild_id, message_id)
+            self.invalidate_message_caches(payload.guild_id, payload.channel_id, message_id)
+            self._edit_scan_records.discard(message_id)
+
+    async def scan_edited_message(self, payload: discord.RawMessageUpdateEvent):
+        """Scan an edited message again when the edit changed what the scan reads.
+
+        discord.py builds payload.message from the gateway payload itself, so edits to messages
+        outside the message cache are covered without a fetch. Unchanged attachments keep their
+        ids, so their OCR text comes from the attachment cache. An edit that arrives while the
+        message is still being scanned waits for that scan and is checked against its record.
+        """
+        self._edit_scan_counts["edits"] += 1
+        message = getattr(payload, "message", None)
+        if message is None:
+            self._edit_scan_counts["no message"] += 1
+            return
+        if message.guild is None:
+            return
+
+        async with self._message_scans.hold(payload.message_id):
+            record = self._edit_scan_records.get(payload.message_id)
+            if record is not None:
+                content_hash, matched = record
+                if matched:
+                    self._edit_scan_counts["already matched"] += 1
+                    return
+                if content_hash == self.scan_content_hash(message):
+                    self._edit_scan_counts["unchanged"] += 1
+                    return
+
+            self._edit_scan_counts["rescanned"] += 1
+            await self.scan_and_act_on_message(message)
+
+    @classmethod
+    def scan_content_hash(cls, message: discord.Message) -> bytes:
+        """Hash every text segment and image attachment key the scan would read."""
+        content_hash = hashlib.blake2b(digest_size=16)
+        for source, text, image_attachment in cls.message_segments(message, include_images=True):
+            content_hash.update(source.encode())
+            content_hash.update(b"\0")
+            content_hash.update((text or "").encode("utf-8", errors="replace"))
+            if image_attachment is not None:
+                content_hash.update(repr(cls.attachment_ocr_cache_key(image_attachment)).encode())
+            content_hash.update(b"\0")
+        return content_hash.digest()
+
     def get_forward_source_guild(self, message: discord.Message):
         guild = self.field_value(message, "guild")
         if self.field_value(guild, "id") == FORWARD_SOURCE_GUILD_ID:
@@ -553,28 +1374,19 @@ class DoxxingDetector(commands.Cog):
 
     @staticmethod
     def is_likely_address_match(match: re.Match[str]) -> bool:
-        street_name = match.group("street_name")
-        suffix = match.group("suffix").lower()
-        street_words = [
-            word.strip(" .'-").lower()
-            for word in street_name.split()
-            if word.strip(" .'-")
-        ]
-        if any(word in CONVERSATIONAL_ADDRESS_WORDS for word in street_words):
+        street_words = ADDRESS_STREET_WORD_RE.findall(match.group("street_name").lower())
+        if not CONVERSATIONAL_ADDRESS_WORDS.isdisjoint(street_words):
             return False
-        if suffix in {"apartment", "apt", "unit"} and all(
-            word in HOUSING_DESCRIPTION_WORDS for word in street_words
-        ):
-            return False
-        return True
+        return not (
+            match.group("suffix").lower() in HOUSING_SUFFIX_WORDS
+            and HOUSING_DESCRIPTION_WORDS.issuperset(street_words)
+        )
 
     @staticmethod
     def has_address(content: str) -> bool:
-        address_matches = ADDRESS_RE.finditer(content)
-        ambiguous_matches = AMBIGUOUS_ADDRESS_RE.finditer(content)
         return any(
             DoxxingDetector.is_likely_address_match(match)
-            for match in [*address_matches, *ambiguous_matches]
+            for match in itertools.chain(ADDRESS_RE.finditer(content), AMBIGUOUS_ADDRESS_RE.finditer(content))
         )
 
     @staticmethod
@@ -590,29 +1402,324 @@ class DoxxingDetector(commands.Cog):
 
         return HTTP_URL_RE.sub(strip_url, content)
 
+    @staticmethod
+    def blank_neutral_tokens(content: str) -> str:
+        """Blank timestamps, game scores, ratings and URLs, one pattern after another.
+
+        A pass is skipped when the ASCII shape of the text rules its pattern out. The shape is
+        taken again after a pass that blanked something, since the blank can join a game score.
+        """
+        shape = None
+        for neutral_re, shape_re in NEUTRAL_TOKEN_BLANKING_ORDER:
+            if shape is None and content.isascii():
+                shape = content.encode("ascii").translate(ASCII_NEUTRAL_SHAPE_BYTES)
+            if shape is not None and shape_re.search(shape) is None:
+                continue
+            content, blanked_count = neutral_re.subn(" ", content)
+            if blanked_count:
+                shape = None
+        if "://" not in content:
+            return content
+        return DoxxingDetector.strip_http_urls(content)
+
     @staticmethod
     def strip_file_tokens(content: str) -> str:
         return FILE_TOKEN_RE.sub(" ", content)
 
     @staticmethod
-    def find_doxxing_types(content: str) -> list[str]:
+    def email_match_at(content: str, at_index: int) -> re.Match[str] | None:
+        start = at_index
+        while start > 0 and content[start - 1] in EMAIL_LOCAL_PART_CHARS:
+            start -= 1
+        if start == at_index:
+            return None
+        return EMAIL_RE.match(content, start)
+
+    @staticmethod
+    def overlaps_file_token(content: str, start: int, end: int) -> bool:
+        token_start = start
+        while token_start > 0 and not content[token_start - 1].isspace():
+            token_start -= 1
+
+        while token_start < end:
+            if FILE_TOKEN_RE.match(content, token_start):
+                return True
+            while token_start < len(content) and not content[token_start].isspace():
+                token_start += 1
+            while token_start < len(content) and content[token_start].isspace():
+                token_start += 1
+        return False
+
+    @staticmethod
+    def possible_doxxing_types(content: str) -> tuple[str, ...]:
+        """Cheap checks that rule out detectors which cannot match.
+
+        Email needs an "@", phone needs ten digits and address needs a digit.
+        On ASCII text the digits are counted in one C-level pass. Whether a
+        street suffix word follows a number is left to the scan, which only
+        looks once a number reaches the address matchers; checking it here cost
+        more than the scan on text whose numbers are all timestamps or scores.
+        """
+        possible_types = []
+        if "@" in content:
+            possible_types.append("email")
+
+        if content.isascii():
+            digit_count = len(content.encode("ascii").translate(None, ASCII_NON_DIGIT_BYTES))
+            has_digit = digit_count > 0
+            has_phone_digits = digit_count >= MIN_PHONE_DIGITS
+        else:
+            first_digit = DIGIT_RE.search(content)
+            has_digit = first_digit is not None
+            has_phone_digits = has_digit and DoxxingDetector.has_min_digits(
+                content, first_digit.start(), MIN_PHONE_DIGITS
+            )
+        if has_phone_digits:
+            possible_types.append("phone number")
+        if has_digit:
+            possible_types.append("address")
+        return tuple(possible_types)
+
+    @staticmethod
+    def has_min_digits(content: str, start: int, minimum: int) -> bool:
+        """Count digits from start without building a list, stopping once minimum is reached."""
+        digits = DIGIT_RE.finditer(content, start)
+        return next(itertools.islice(digits, minimum - 1, None), None) is not None
+
+    @staticmethod
+    def last_suffix_word_start(content: str) -> int:
+        """Where the last street suffix word may start; no address can begin at or after it.
+
+        ASCII text is tokenized and checked against the suffix words, tail first, returning 0 when
+        none appears. A word cut at either edge of a window only moves the result later, which is
+        safe. Other text keeps the whole message, since case folding can change where its words
+        split.
+        """
+        if not content.isascii():
+            return len(content)
+        folded_words = content.encode("ascii").translate(ASCII_FOLDED_WORD_BYTES)
+        tail_start = max(0, len(folded_words) - ADDRESS_SUFFIX_TAIL_CHARS)
+        suffix_words = ADDRESS_SUFFIX_WORD_BYTES.intersection(folded_words[tail_start:].split())
+        if suffix_words:
+            return max(folded_words.rfind(word, tail_start) for word in suffix_words)
+        if not tail_start:
+            return 0
+        head_end = tail_start + ADDRESS_SUFFIX_WORD_MAX_CHARS
+        suffix_words = ADDRESS_SUFFIX_WORD_BYTES.intersection(folded_words[:head_end].split())
+        return max((folded_words.rfind(word, 0, head_end) for word in suffix_words), default=0)
+
+    @staticmethod
+    def find_doxxing_types(content: str, possible_types: tuple[str, ...] | None = None) -> list[str]:
+        """Scan content once for emails, phone numbers and addresses.
+
+        Timestamps, game scores, ratings and URLs are blanked first by
+        blank_neutral_tokens, then the rest is scanned in one pass. Address
+        matching stops at the first likely address and at the last street suffix
+        word.
+        """
+        if possible_types is None:
+            possible_types = DoxxingDetector.possible_doxxing_types(content)
+        if not possible_types:
+            return []
+        content = DoxxingDetector.blank_neutral_tokens(content)
+        scan_email = "email" in possible_types
+        scan_phone = "phone number" in possible_types
+        scan_address = "address" in possible_types
+
+        email_found = False
+        phone_matches = []
+        address_found = False
+        address_scan_end = None
+        address_end = 0
+        ambiguous_address_end = 0
+        position = 0
+
+        trigger_re = ASCII_SCAN_TRIGGER_RE if content.isascii() else SCAN_TRIGGER_RE
+        while True:
+            trigger = trigger_re.search(content, position)
+            if trigger is None:
+                break
+            start = trigger.start()
+            position = start + 1
+            if content[start] == "@":
+                if scan_email and DoxxingDetector.email_match_at(content, start) is not None:
+                    email_found = True
+                    scan_email = False
+                continue
+
+            if scan_phone:
+                phone_match = PHONE_RE.match(content, start)
+                if phone_match is not None:
+                    phone_matches.append(phone_match)
+            if not scan_address:
+                continue
+            if address_scan_end is None:
+                address_scan_end = DoxxingDetector.last_suffix_word_start(content)
+            if start >= address_scan_end:
+                scan_address = False
+                if not (scan_email or scan_phone):
+                    break
+                continue
+            if start >= address_end:
+                address_match = ADDRESS_RE.match(content, start)
+                if address_match is not None:
+                    address_end = address_match.end()
+                    if DoxxingDetector.is_likely_address_match(address_match):
+                        address_found = True
+            if start >= ambiguous_address_end:
+                ambiguous_match = AMBIGUOUS_ADDRESS_RE.match(content, start)
+                if ambiguous_match is not None:
+                    ambiguous_address_end = ambiguous_match.end()
+                    if DoxxingDetector.is_likely_address_match(ambiguous_match):
+                        address_found = True
+            if address_found:
+                scan_address = False
+                if not (scan_email or scan_phone):
+                    break
+
         matches = []
-        searchable_content = DISCORD_TIMESTAMP_RE.sub(" ", content)
-        searchable_content = VIDEO_TIMESTAMP_RE.sub(" ", searchable_content)
-        searchable_content = GAME_SCORE_RE.sub(" ", searchable_content)
-        searchable_content = RATING_RE.sub(" ", searchable_content)
-        searchable_content = DoxxingDetector.strip_http_urls(searchable_content)
-        phone_searchable_content = DoxxingDetector.strip_file_tokens(searchable_content)
-
-        if EMAIL_RE.search(searchable_content):
+        if email_found:
             matches.append("email")
-        if PHONE_RE.search(phone_searchable_content):
+        if any(
+            not DoxxingDetector.overlaps_file_token(content, match.start(), match.end())
+            for match in phone_matches
+        ):
             matches.append("phone number")
-        if DoxxingDetector.has_address(searchable_content):
+        if address_found:
             matches.append("address")
 
         return matches
 
+    def scan_doxxing_types(self, content: str) -> list[str]:
+        possible_types = self.possible_doxxing_types(content)
+        self._prefilter_counts["messages"] += 1
+        if not possible_types:
+            self._prefilter_counts["all"] += 1
+        for match_type in DOXXING_TYPES:
+            if match_type not in possible_types:
+                self._prefilter_counts[match_type] += 1
+        return self.find_doxxing_types(content, possible_types)
+
+    def scan_stats_report(self) -> str:
+        scanned = self._prefilter_counts["messages"]
+
+        def rejected(name: str) -> str:
+            count = self._prefilter_counts[name]
+            share = f" ({count / scanned:.1%})" if scanned else ""
+            return f"{count}{share}"
+
+        lines = [
+            f"Messages scanned: {scanned}",
+            f"Pre-filter skipped every detector: {rejected('all')}",
+        ]
+        lines.extend(
+            f"Pre-filter skipped {match_type}: {rejected(match_type)}"
+            for match_type in DOXXING_TYPES
+        )
+        return "\n".join(lines)
+
+    def latency_stats_report(self) -> str:
+        lines = [f"Messages scanned per minute: {self.scans_per_minute():.1f} (last {SCAN_RATE_WINDOW_MINUTES} min)"]
+        lines.extend(
+            f"{stage.capitalize()}: {self._stage_latencies[stage].stats_text()}"
+            for stage in LATENCY_STAGES
+        )
+        return "\n".join(lines)
+
+    def record_stage_latency(self, stage: str, seconds: float):
+        self._stage_latencies[stage].record(seconds)
+
+    @contextlib.contextmanager
+    def timed_stage(self, stage: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage_latency(stage, time.perf_counter() - started_at)
+
+    def record_scan(self):
+        minute = int((time.monotonic() - self._started_at) // 60)
+        if self._scans_per_minute and self._scans_per_minute[-1][0] == minute:
+            self._scans_per_minute[-1][1] += 1
+        else:
+            self._scans_per_minute.append([minute, 1])
+
+    def scans_per_minute(self) -> float:
+        elapsed_minutes = (time.monotonic() - self._started_at) / 60
+        window_start = max(0.0, elapsed_minutes - SCAN_RATE_WINDOW_MINUTES)
+        scans = sum(count for minute, count in self._scans_per_minute if minute >= int(window_start))
+        # The window is shorter than SCAN_RATE_WINDOW_MINUTES until the cog has run that long.
+        return scans / max(elapsed_minutes - int(window_start), 1 / 60)
+
+    def cache_stats_report(self) -> str:
+        return "\n".join(
+            [
+                f"Reference fetch cache: {self._reference_fetch_cache.stats_text()}",
+                f"Message refetch cache: {self._message_refetch_cache.stats_text()}",
+                (
+                    f"Failed fetch cache: {self._failed_fetch_cache.stats_text()}, "
+                    f"{self._avoided_fetch_counts['channel']} channel and "
+                    f"{self._avoided_fetch_counts['message']} message fetches avoided"
+                ),
+                f"Attachment OCR cache: {self._attachment_ocr_cache.stats_text()}",
+                f"Message location index: {self._message_locations.stats_text()}",
+                (
+                    f"Edit scan records: {self._edit_scan_records.stats_text()}, "
+                    f"{self._edit_scan_counts['edits']} edits, {self._edit_scan_counts['rescanned']} rescanned, "
+                    f"{self._edit_scan_counts['unchanged']} unchanged, "
+                    f"{self._edit_scan_counts['already matched']} already matched, "
+                    f"{self._edit_scan_counts['no message']} without a message"
+                ),
+                f"Guild reference sweeps: {self.reference_sweep_stats_text()}",
+                f"Reference fetches in flight: {self._reference_flights.stats_text()}",
+                f"Attachment OCR in flight: {self._ocr_flights.stats_text()}",
+            ]
+        )
+
+    def ocr_stats_report(self) -> str:
+        skipped = sum(self._ocr_counts[name] for name in ("attachment", "bytes", "perceptual hash"))
+        return "\n".join(
+            [
+                f"OCR runs: {self._ocr_counts['runs']}",
+                f"OCR runs skipped: {skipped}",
+                f"Skipped by attachment id/url: {self._ocr_counts['attachment']}",
+                f"Skipped by image bytes: {self._ocr_counts['bytes']}",
+                f"Skipped by perceptual hash: {self._ocr_counts['perceptual hash']}",
+                f"OCR avoided by plain-text verdicts: {self._ocr_counts['text verdicts']}",
+                f"OCR cancelled after a match: {self._ocr_counts['cancelled']}",
+                f"OCR queue: {self._ocr_queue.stats_text()}",
+                f"OCR executor: {self._ocr_executor.stats_text()}",
+                f"OCR preprocessing: {self.ocr_preprocess_stats_text()}",
+            ]
+        )
+
+    def record_ocr_timings(self, timings: dict):
+        self.record_stage_latency("ocr preprocess", timings["preprocess_seconds"])
+        self.record_stage_latency("tesseract", timings["ocr_seconds"])
+        self._ocr_timings["images"] += 1
+        for name, value in timings.items():
+            self._ocr_timings[name] += value
+        if timings["pixels_before"] != timings["pixels_after"]:
+            self._ocr_timings["preprocessed images"] += 1
+
+    def ocr_preprocess_stats_text(self) -> str:
+        images = self._ocr_timings["images"]
+        if not images:
+            return "no images yet"
+
+        pixels_before = self._ocr_timings["pixels_before"]
+        pixels_after = self._ocr_timings["pixels_after"]
+        preprocess_seconds = self._ocr_timings["preprocess_seconds"]
+        # OCR time grows with pixel count, so the pixels removed are priced at the observed rate.
+        seconds_per_pixel = self._ocr_timings["ocr_seconds"] / pixels_after if pixels_after else 0.0
+        saved_seconds = (pixels_before - pixels_after) * seconds_per_pixel - preprocess_seconds
+        return (
+            f"{self._ocr_timings['preprocessed images']}/{images} images shrunk or cropped, "
+            f"{pixels_before / images / 1e6:.2f} -> {pixels_after / images / 1e6:.2f} MP avg, "
+            f"{preprocess_seconds / images * 1000:.0f} ms avg cost, "
+            f"~{saved_seconds / images * 1000:.0f} ms saved per image"
+        )
+
     @staticmethod
     def can_timeout(target: discord.Member, me: discord.Member) -> bool:
         if target == me:
@@ -629,17 +1736,23 @@ class DoxxingDetector(commands.Cog):
             return item.get(name, default)
         return getattr(item, name, default)
 
+    @staticmethod
+    def field_value_or_raise(item, name: str):
+        if isinstance(item, dict):
+            try:
+                return item[name]
+            except KeyError:
+                raise AttributeError(name) from None
+        return getattr(item, name)
+
     @classmethod
     def sequence_field(cls, item, name: str) -> list:
         value = cls.field_value(item, name, [])
         return value or []
 
-    @classmethod
-    def forward_snapshots(cls, message: discord.Message) -> list:
-        return [
-            cls.snapshot_payload(snapshot)
-            for snapshot in cls.sequence_field(message, "message_snapshots")
-        ]
+    @staticmethod
+    def forward_snapshots(message: discord.Message) -> list:
+        return MessageView.of(message).snapshots
 
     @classmethod
     def snapshot_payload(cls, snapshot):
@@ -700,24 +1813,28 @@ class DoxxingDetector(commands.Cog):
             return "", "Message is missing id or channel."
 
         cache_key = (channel_id, message_id)
-        if cache_key in self._message_refetch_cache:
-            return self._message_refetch_cache[cache_key]
+        cached_result = self._message_refetch_cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
 
         fetch_message = getattr(channel, "fetch_message", None)
         if fetch_message is None:
             return "", f"Current channel `{channel_id}` does not support message fetch."
 
-        try:
-            fetched_message = await fetch_message(message_id)
-        except discord.Forbidden:
-            return "", f"Missing permission to refetch message `{message_id}` in channel `{channel_id}`."
-        except discord.NotFound:
-            return "", f"Message `{message_id}` was not found when refetching current channel `{channel_id}`."
-        except discord.HTTPException as exc:
-            return "", f"Failed to refetch message `{message_id}` in channel `{channel_id}`: {exc}"
-
-        result = (await self.async_message_search_content(fetched_message), None)
-        self._message_refetch_cache[cache_key] = result
+        with self.timed_stage("message refetch"):
+            fetched_message, failure = await self.fetch_message_or_cached_failure(fetch_message, channel_id, message_id)
+        if failure is not None:
+            kind, detail = failure
+            if kind == "forbidden":
+                return "", f"Missing permission to refetch message `{message_id}` in channel `{channel_id}`."
+            if kind == "not found":
+                return "", f"Message `{message_id}` was not found when refetching current channel `{channel_id}`."
+            return "", f"Failed to refetch message `{message_id}` in channel `{channel_id}`: {detail}"
+
+        unscanned_images = []
+        result = (await self.async_message_search_content(fetched_message, unscanned_images=unscanned_images), None)
+        if not unscanned_images:
+            self._message_refetch_cache.set(cache_key, result)
         return result
 
     @classmethod
@@ -754,7 +1871,13 @@ class DoxxingDetector(commands.Cog):
         self,
         attachment: discord.Attachment | dict,
         guild: discord.Guild | None = None,
+        priority: int = 0,
     ) -> str:
+        """OCR an image attachment through the cache and the OCR queue.
+
+        Raises OcrQueueFull when the image would have to wait in a full queue, and OcrFailed once
+        a failed read or OCR run has been logged, so callers can tell it from an image with no text.
+        """
         if not self.is_image_attachment(attachment):
             return ""
 
@@ -766,61 +1889,258 @@ class DoxxingDetector(commands.Cog):
         if read_attachment is None:
             return ""
 
+        # Unknown sizes queue behind every image of known size.
+        queue_size = size or MAX_OCR_ATTACHMENT_BYTES
         cache_key = self.attachment_ocr_cache_key(attachment)
-        if cache_key is not None and cache_key in self._attachment_ocr_cache:
-            return self._attachment_ocr_cache[cache_key]
+        if cache_key is None:
+            return await self._ocr_queue.run(
+                priority,
+                queue_size,
+                lambda: self.read_attachment_ocr_text(attachment, guild, None),
+            )
+
+        cached_text = self._attachment_ocr_cache.get(cache_key)
+        if cached_text is not None:
+            self._ocr_counts["attachment"] += 1
+            return cached_text
+        return await self._ocr_flights.run(
+            cache_key,
+            lambda: self._ocr_queue.run(
+                priority,
+                queue_size,
+                lambda: self.read_attachment_ocr_text(attachment, guild, cache_key),
+            ),
+        )
+
+    def ocr_priority(self, message: discord.Message) -> int:
+        """0 for forwards from always-delete roles and for new accounts, 1 for everyone else."""
+        author = self.field_value(message, "author")
+        if self.has_forward_like_reference(message) and self.has_always_delete_forward_role(author):
+            return 0
+        created_at = self.field_value(author, "created_at")
+        if isinstance(created_at, datetime.datetime) and discord.utils.utcnow() - created_at < OCR_PRIORITY_NEW_ACCOUNT_AGE:
+            return 0
+        return 1
+
+    async def log_ocr_shed(self, guild: discord.Guild | None = None):
+        self._ocr_shed_since_log += 1
+        now = time.monotonic()
+        if self._ocr_shed_logged_at is not None and now - self._ocr_shed_logged_at < OCR_SHED_LOG_INTERVAL_SECONDS:
+            return
 
+        self._ocr_shed_logged_at = now
+        shed, self._ocr_shed_since_log = self._ocr_shed_since_log, 0
+        embed = discord.Embed(
+            title="Doxxing detector warning",
+            description=(
+                f"The OCR queue is full ({OCR_QUEUE_MAX_JOBS} images waiting), so {shed} image(s) were not "
+                f"OCR'd since the last warning. Shed policy: `{OCR_QUEUE_SHED_POLICY}`. "
+                f"Further warnings are held for {OCR_SHED_LOG_INTERVAL_SECONDS} seconds."
+            ),
+            color=discord.Color.orange(),
+            timestamp=discord.utils.utcnow(),
+        )
+        await self.send_log_embed(embed, guild)
+
+    async def read_attachment_ocr_text(
+        self,
+        attachment: discord.Attachment | dict,
+        guild: discord.Guild | None,
+        cache_key,
+    ) -> str:
         try:
-            image_bytes = await read_attachment()
+            image_bytes = await attachment.read()
             if not image_bytes:
                 return ""
-            text = await self.ocr_image_bytes(image_bytes)
+            content_keys = [("sha256", hashlib.sha256(image_bytes).digest())]
+            cached_text = self._attachment_ocr_cache.get(content_keys[0])
+            if cached_text is not None:
+                self._ocr_counts["bytes"] += 1
+                self.cache_ocr_text(cached_text, cache_key, *content_keys)
+                return cached_text
+
+            if OCR_PERCEPTUAL_HASH_ENABLED:
+                perceptual_hash = await self._ocr_executor.run(self.perceptual_image_hash, image_bytes)
+                if perceptual_hash is not None:
+                    content_keys.append(("dhash", perceptual_hash))
+                    cached_text = self._attachment_ocr_cache.get(content_keys[1])
+                    if cached_text is not None:
+                        self._ocr_counts["perceptual hash"] += 1
+                        self.cache_ocr_text(cached_text, cache_key, *content_keys)
+                        return cached_text
+
+            text = await self._ocr_flights.run(content_keys[0], lambda: self.counted_ocr_image_bytes(image_bytes))
         except ImportError as exc:
             await self.warn_missing_ocr_dependencies(exc, guild)
-            return ""
-        except asyncio.TimeoutError:
+            raise OcrFailed(str(exc)) from exc
+        except asyncio.TimeoutError as exc:
             await self.warn_ocr_failure(
                 attachment,
                 TimeoutError(f"OCR exceeded {OCR_TIMEOUT_SECONDS} seconds."),
                 guild,
             )
-            return ""
+            raise OcrFailed(f"OCR exceeded {OCR_TIMEOUT_SECONDS} seconds.") from exc
         except Exception as exc:
             await self.warn_ocr_failure(attachment, exc, guild)
-            return ""
+            raise OcrFailed(str(exc)) from exc
 
         text = " ".join(text.split())
-        if cache_key is not None:
-            self._attachment_ocr_cache[cache_key] = text
+        self.cache_ocr_text(text, cache_key, *content_keys)
         return text
 
+    async def counted_ocr_image_bytes(self, image_bytes: bytes) -> str:
+        self._ocr_counts["runs"] += 1
+        return await self.ocr_image_bytes(image_bytes)
+
+    def cache_ocr_text(self, text: str, *cache_keys):
+        for cache_key in cache_keys:
+            if cache_key is not None:
+                self._attachment_ocr_cache.set(cache_key, text)
+
+    @staticmethod
+    def perceptual_image_hash(image_bytes: bytes) -> tuple | None:
+        """Return a difference hash of the image, or None when Pillow cannot decode it."""
+        try:
+            from PIL import Image
+        except ImportError:
+            return None
+
+        hash_size = OCR_PERCEPTUAL_HASH_SIZE
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as image:
+                image_size = image.size
+                pixels = list(image.convert("L").resize((hash_size + 1, hash_size)).getdata())
+        except Exception:
+            return None
+
+        bits = 0
+        for row in range(hash_size):
+            offset = row * (hash_size + 1)
+            for column in range(hash_size):
+                bits = (bits << 1) | (pixels[offset + column] > pixels[offset + column + 1])
+        # Aspect ratio keeps differently shaped images with similar gradients apart.
+        return (round(image_size[0] / max(image_size[1], 1), 2), bits)
+
     def get_ocr_engine(self):
         if self._ocr_engine is None:
             self._ocr_engine = self.load_ocr_engine()
         return self._ocr_engine
 
     async def ocr_image_bytes(self, image_bytes: bytes) -> str:
-        loop = asyncio.get_running_loop()
-        if self._ocr_engine is None:
-            async with self._ocr_engine_lock:
-                if self._ocr_engine is None:
-                    self._ocr_engine = await asyncio.wait_for(
-                        loop.run_in_executor(self._ocr_executor, self.load_ocr_engine),
-                        timeout=OCR_TIMEOUT_SECONDS,
+        if self._ocr_executor.backend == "process":
+            text, timings = await self._ocr_executor.run(process_image_text, image_bytes)
+        else:
+            if self._ocr_engine is None:
+                async with self._ocr_engine_lock:
+                    if self._ocr_engine is None:
+                        self._ocr_engine = await self._ocr_executor.run(self.load_ocr_engine)
+            text, timings = await self._ocr_executor.run(self.engine_image_text, self._ocr_engine, image_bytes)
+        self.record_ocr_timings(timings)
+        return text
+
+    @staticmethod
+    def engine_image_text(engine, image_bytes: bytes) -> tuple[str, dict]:
+        started_at = time.perf_counter()
+        image, pixels_before, pixels_after = DoxxingDetector.preprocess_ocr_image(image_bytes)
+        preprocessed_at = time.perf_counter()
+        text = engine.image_to_text(image)
+        return text, {
+            "pixels_before": pixels_before,
+            "pixels_after": pixels_after,
+            "preprocess_seconds": preprocessed_at - started_at,
+            "ocr_seconds": time.perf_counter() - preprocessed_at,
+        }
+
+    @staticmethod
+    def preprocess_ocr_image(image_bytes: bytes):
+        """Decode, grayscale, crop and shrink an image for OCR.
+
+        Returns the image to OCR with its pixel count before and after. Without Pillow, or for
+        formats Pillow cannot read, the original bytes are returned for the engine to decode.
+        """
+        if not OCR_PREPROCESS_ENABLED:
+            return image_bytes, 0, 0
+        try:
+            from PIL import Image, ImageFilter
+        except ImportError:
+            return image_bytes, 0, 0
+
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as decoded_image:
+                pixels_before = decoded_image.width * decoded_image.height
+                scale = max(min(1.0, (OCR_MAX_IMAGE_PIXELS / pixels_before) ** 0.5), OCR_MIN_IMAGE_SCALE)
+                # JPEG can decode straight to grayscale at a reduced size, skipping full-size work.
+                decoded_image.draft(
+                    "L",
+                    (round(decoded_image.width * scale), round(decoded_image.height * scale)),
+                )
+                if decoded_image.mode in ("RGBA", "LA", "PA") or "transparency" in decoded_image.info:
+                    # Flatten onto white as tesseract's own loader does; a plain grayscale
+                    # conversion keeps the hidden colour of transparent pixels, usually black.
+                    rgba_image = decoded_image.convert("RGBA")
+                    background = Image.new("RGBA", rgba_image.size, "white")
+                    image = Image.alpha_composite(background, rgba_image).convert("L")
+                else:
+                    image = decoded_image.convert("L")
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return image_bytes, 0, 0
+
+        if OCR_CROP_TO_TEXT_REGION:
+            sample = image.reduce(OCR_CROP_SAMPLE_FACTOR) if min(image.size) >= OCR_CROP_SAMPLE_FACTOR * 3 else image
+            # FIND_EDGES leaves the outermost pixels unfiltered, so they are dropped before the bbox.
+            edges = (
+                sample.filter(ImageFilter.FIND_EDGES)
+                .crop((1, 1, sample.width - 1, sample.height - 1))
+                .point(lambda value: 255 if value >= OCR_CROP_EDGE_THRESHOLD else 0)
+            )
+            box = edges.getbbox()
+            if box is not None:
+                factor_x = image.width / sample.width
+                factor_y = image.height / sample.height
+                image = image.crop(
+                    (
+                        max(0, int((box[0] + 1) * factor_x) - OCR_CROP_MARGIN_PIXELS),
+                        max(0, int((box[1] + 1) * factor_y) - OCR_CROP_MARGIN_PIXELS),
+                        min(image.width, int((box[2] + 1) * factor_x) + OCR_CROP_MARGIN_PIXELS),
+                        min(image.height, int((box[3] + 1) * factor_y) + OCR_CROP_MARGIN_PIXELS),
                     )
-        return await asyncio.wait_for(
-            loop.run_in_executor(self._ocr_executor, self.image_bytes_to_text, image_bytes),
-            timeout=OCR_TIMEOUT_SECONDS,
-        )
+                )
+
+        scale = max(min(1.0, (OCR_MAX_IMAGE_PIXELS / (image.width * image.height)) ** 0.5), OCR_MIN_IMAGE_SCALE)
+        if scale < 1.0:
+            image = image.resize(
+                (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                Image.Resampling.LANCZOS,
+            )
+        return image, pixels_before, image.width * image.height
 
     @staticmethod
     def load_ocr_engine():
+        try:
+            import tesserocr
+            from PIL import Image
+        except ImportError:
+            pass
+        else:
+            try:
+                return TesserocrOcrEngine(tesserocr, Image)
+            except RuntimeError:
+                # tesserocr could not initialise (usually no language data); use the CLI instead.
+                pass
+
         try:
             import pytesseract
         except ImportError as exc:
             raise ImportError(f"pytesseract: {exc}") from exc
         return TesseractOcrEngine(pytesseract)
 
+    def active_ocr_engine_name(self) -> str:
+        if self._ocr_engine is not None:
+            return self._ocr_engine.name
+        if self._ocr_executor.backend == "process":
+            return "loaded separately in each OCR worker process"
+        return "not loaded yet (loads on first OCR)"
+
     @staticmethod
     def package_version(package_name: str) -> str:
         try:
@@ -833,6 +2153,7 @@ class DoxxingDetector(commands.Cog):
             f"Python: {sys.version.split()[0]}",
             f"Executable: {sys.executable}",
             f"pytesseract: {self.package_version('pytesseract')}",
+            f"tesserocr: {self.package_version('tesserocr')}",
             f"Pillow: {self.package_version('Pillow')}",
             f"tesseract: {shutil.which('tesseract') or '[not on PATH]'}",
             f"heroku tesseract: {'present' if os.path.exists('/app/.apt/usr/bin/tesseract') else 'missing'}",
@@ -851,6 +2172,7 @@ class DoxxingDetector(commands.Cog):
             lines.append(f"OCR import: FAILED - {exc}")
         else:
             lines.append(f"OCR import: OK - {backend_name}")
+        lines.append(f"Active OCR engine: {self.active_ocr_engine_name()}")
 
         if self._ocr_dependency_error is not None:
             error = self._ocr_dependency_error
@@ -860,6 +2182,13 @@ class DoxxingDetector(commands.Cog):
 
     @staticmethod
     def ocr_backend_import_status() -> str:
+        try:
+            import tesserocr
+        except ImportError:
+            pass
+        else:
+            return f"tesserocr {getattr(tesserocr, '__version__', '[unknown version]')}"
+
         try:
             import pytesseract
         except ImportError as exc:
@@ -867,55 +2196,90 @@ class DoxxingDetector(commands.Cog):
         return f"pytesseract {getattr(pytesseract, '__version__', '[unknown version]')}"
 
     def image_bytes_to_text(self, image_bytes: bytes) -> str:
-        with tempfile.NamedTemporaryFile(suffix=".png") as image_file:
-            image_file.write(image_bytes)
-            image_file.flush()
-            return self.get_ocr_engine().image_to_text(image_file.name)
+        return self.engine_image_text(self.get_ocr_engine(), image_bytes)[0]
 
     async def async_message_search_content(
         self,
         message: discord.Message,
         seen: set[int] | None = None,
+        ocr_slots: asyncio.Semaphore | None = None,
+        stop_on_match: bool = False,
+        unscanned_images: list | None = None,
     ) -> str:
-        if seen is None:
-            seen = set()
+        """The searchable text of a message with its images OCRed.
 
-        message_id = id(message)
-        if message_id in seen:
-            return ""
-        seen.add(message_id)
+        Images whose OCR was shed or failed are appended to unscanned_images, so a caller can
+        avoid caching text that is missing them.
+        """
+        parts = await self.async_message_search_parts(
+            message,
+            seen,
+            ocr_slots,
+            stop_on_match,
+            shed_images=unscanned_images,
+            failed_images=unscanned_images,
+        )
+        return ScanResult(parts).content
 
-        parts = [self.field_value(message, "content", "")]
+    async def async_message_search_parts(
+        self,
+        message: discord.Message,
+        seen: set[int] | None = None,
+        ocr_slots: asyncio.Semaphore | None = None,
+        stop_on_match: bool = False,
+        shed_images: list | None = None,
+        parts: list | None = None,
+        failed_images: list | None = None,
+    ) -> list[tuple[str, str]]:
+        """OCR a message's images alongside its text, returning the non-empty parts in source order.
+
+        When a parts list is passed it is filled in place, so a caller that cancels the search
+        still has the text parts and every OCR result that finished before the cancel.
+        """
+        if ocr_slots is None:
+            ocr_slots = asyncio.Semaphore(MAX_CONCURRENT_MESSAGE_OCR)
         guild = self.field_value(message, "guild")
+        priority = self.ocr_priority(message)
 
-        for embed in self.sequence_field(message, "embeds"):
-            parts.append(self.embed_text(embed))
-
-        for attachment in self.sequence_field(message, "attachments"):
-            parts.append(self.attachment_text(attachment))
-            if self.is_image_attachment(attachment):
-                parts.append(await self.ocr_attachment_text(attachment, guild))
-
-        for snapshot in self.forward_snapshots(message):
-            parts.append(self.field_value(snapshot, "content", ""))
-            for embed in self.sequence_field(snapshot, "embeds"):
-                parts.append(self.embed_text(embed))
-            for attachment in self.sequence_field(snapshot, "attachments"):
-                parts.append(self.attachment_text(attachment))
-                if self.is_image_attachment(attachment):
-                    parts.append(await self.ocr_attachment_text(attachment, guild))
-
-        reference = self.field_value(message, "reference")
-        if reference is not None and self.is_forward_reference(reference):
-            resolved = self.field_value(reference, "resolved")
-            if isinstance(resolved, discord.Message):
-                parts.append(await self.async_message_search_content(resolved, seen))
-
-            cached_message = self.field_value(reference, "cached_message")
-            if isinstance(cached_message, discord.Message):
-                parts.append(await self.async_message_search_content(cached_message, seen))
-
-        return "\n".join(part for part in parts if part)
+        async def bounded_ocr(attachment):
+            async with ocr_slots:
+                try:
+                    return await self.ocr_attachment_text(attachment, guild, priority)
+                except OcrQueueFull:
+                    self._ocr_counts["shed"] += 1
+                    if shed_images is not None:
+                        shed_images.append(attachment)
+                    await self.log_ocr_shed(guild)
+                    return ""
+                except OcrFailed:
+                    if failed_images is not None:
+                        failed_images.append(attachment)
+                    return ""
+
+        # OCR starts as soon as the walk reaches an image; results fill their slot in order.
+        if parts is None:
+            parts = []
+        task_indexes = {}
+        for source, text, image_attachment in self.message_segments(message, seen, include_images=True):
+            if image_attachment is not None:
+                task_indexes[asyncio.ensure_future(bounded_ocr(image_attachment))] = len(parts)
+            parts.append((source, text))
+
+        pending = set(task_indexes)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = task_indexes[task]
+                    parts[index] = (parts[index][0], task.result())
+                if stop_on_match and any(self.find_doxxing_types(task.result()) for task in done):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+                self._ocr_counts["cancelled"] += 1
+
+        return [(source, text) for source, text in parts if text]
 
     @staticmethod
     def is_forward_reference(reference) -> bool:
@@ -939,61 +2303,114 @@ class DoxxingDetector(commands.Cog):
 
     @classmethod
     def message_search_content(cls, message: discord.Message, seen: set[int] | None = None) -> str:
+        return ScanResult(cls.message_search_parts(message, seen)).content
+
+    @classmethod
+    def message_search_parts(cls, message: discord.Message, seen: set[int] | None = None) -> list[tuple[str, str]]:
+        return [(source, text) for source, text, _image in cls.message_segments(message, seen) if text]
+
+    @classmethod
+    def message_segments(cls, message: discord.Message, seen: set[int] | None = None, include_images: bool = False):
+        """Lazily yield (source, text, image attachment) for every searchable piece of a message.
+
+        Forwarded snapshots and resolved forwards are walked in place, so callers can stop at any
+        segment. With include_images, each image attachment also yields a segment with empty text
+        and the attachment to OCR; otherwise the image attachment slot is always None.
+        """
         if seen is None:
             seen = set()
 
-        message_id = id(message)
+        view = MessageView.of(message)
+        message_id = id(view.message)
         if message_id in seen:
-            return ""
+            return
         seen.add(message_id)
 
-        parts = [cls.field_value(message, "content", "")]
-
-        for embed in cls.sequence_field(message, "embeds"):
-            parts.append(cls.embed_text(embed))
-
-        for attachment in cls.sequence_field(message, "attachments"):
-            parts.append(cls.attachment_text(attachment))
+        yield "content", view.content, None
+        yield from cls.embed_and_attachment_segments(view, "", include_images)
 
-        for snapshot in cls.forward_snapshots(message):
-            parts.append(cls.field_value(snapshot, "content", ""))
-            for embed in cls.sequence_field(snapshot, "embeds"):
-                parts.append(cls.embed_text(embed))
-            for attachment in cls.sequence_field(snapshot, "attachments"):
-                parts.append(cls.attachment_text(attachment))
+        for snapshot in cls.forward_snapshots(view):
+            yield "snapshot", cls.field_value(snapshot, "content", ""), None
+            yield from cls.embed_and_attachment_segments(snapshot, "snapshot ", include_images)
 
-        reference = cls.field_value(message, "reference")
-        if reference is not None and cls.is_forward_reference(reference):
+        reference = view.reference
+        if reference is not None and view.is_forward_reference:
             resolved = cls.field_value(reference, "resolved")
             if isinstance(resolved, discord.Message):
-                parts.append(cls.message_search_content(resolved, seen))
+                yield from cls.message_segments(resolved, seen, include_images)
 
             cached_message = cls.field_value(reference, "cached_message")
             if isinstance(cached_message, discord.Message):
-                parts.append(cls.message_search_content(cached_message, seen))
+                yield from cls.message_segments(cached_message, seen, include_images)
 
-        return "\n".join(part for part in parts if part)
+    @classmethod
+    def embed_and_attachment_segments(cls, message, source_prefix: str, include_images: bool):
+        for embed in cls.sequence_field(message, "embeds"):
+            yield f"{source_prefix}embed", cls.embed_text(embed), None
+
+        for attachment in cls.sequence_field(message, "attachments"):
+            yield f"{source_prefix}attachment", cls.attachment_text(attachment), None
+            if include_images and cls.is_image_attachment(attachment):
+                yield f"{source_prefix}ocr", "", attachment
 
     async def fetch_message_content_from_channel(
         self,
         channel,
         channel_id,
         message_id,
+        unscanned_images: list | None = None,
     ) -> tuple[str, str | None]:
         fetch_message = getattr(channel, "fetch_message", None)
         if fetch_message is None:
             return "", f"Referenced channel `{channel_id}` does not support message fetch."
 
+        referenced_message, failure = await self.fetch_message_or_cached_failure(fetch_message, channel_id, message_id)
+        if failure is not None:
+            kind, detail = failure
+            if kind == "forbidden":
+                return "", f"Missing permission to fetch referenced message `{message_id}` in channel `{channel_id}`."
+            if kind == "not found":
+                return "", f"Referenced message `{message_id}` was not found in channel `{channel_id}`."
+            return "", f"Failed to fetch referenced message `{message_id}` in channel `{channel_id}`: {detail}"
+
+        return await self.async_message_search_content(referenced_message, unscanned_images=unscanned_images), None
+
+    async def fetch_message_or_cached_failure(self, fetch_message, channel_id, message_id):
+        # Missing access applies to the whole channel, so a Forbidden answer (or an unknown
+        # channel) skips every message fetch there until it expires.
+        return await self.fetch_or_cached_failure(
+            fetch_message,
+            message_id,
+            ("message", channel_id, message_id),
+            channel_failure_key=("message channel", channel_id),
+        )
+
+    async def fetch_or_cached_failure(self, fetch, object_id, failure_key, channel_failure_key=None):
+        """Call a Discord fetch unless it failed recently, returning (result, (kind, detail) | None)."""
+        for key in (channel_failure_key, failure_key):
+            failure = self._failed_fetch_cache.get(key) if key is not None else None
+            if failure is not None:
+                self._avoided_fetch_counts[failure_key[0]] += 1
+                return None, failure
+
         try:
-            referenced_message = await fetch_message(message_id)
-        except discord.Forbidden:
-            return "", f"Missing permission to fetch referenced message `{message_id}` in channel `{channel_id}`."
-        except discord.NotFound:
-            return "", f"Referenced message `{message_id}` was not found in channel `{channel_id}`."
+            return await fetch(object_id), None
+        except discord.Forbidden as exc:
+            failure = ("forbidden", str(exc))
+            key = channel_failure_key or failure_key
+            ttl_seconds = FAILED_FETCH_CACHE_TTL_SECONDS
+        except discord.NotFound as exc:
+            failure = ("not found", str(exc))
+            key = channel_failure_key if exc.code == UNKNOWN_CHANNEL_ERROR_CODE else None
+            key = key or failure_key
+            ttl_seconds = FAILED_FETCH_CACHE_TTL_SECONDS
         except discord.HTTPException as exc:
-            return "", f"Failed to fetch referenced message `{message_id}` in channel `{channel_id}`: {exc}"
+            failure = ("http", str(exc))
+            key = failure_key
+            ttl_seconds = FAILED_FETCH_BACKOFF_SECONDS
 
-        return await self.async_message_search_content(referenced_message), None
+        self._failed_fetch_cache.set(key, failure, ttl_seconds=ttl_seconds)
+        return None, failure
 
     async def fetch_referenced_message_content(self, message: discord.Message) -> tuple[str, str | None]:
         reference = self.field_value(message, "reference")
@@ -1003,14 +2420,55 @@ class DoxxingDetector(commands.Cog):
         message_id = self.field_value(reference, "message_id")
         if not message_id:
             return "", "Reference is missing message_id."
-        cache_key = (id(message), channel_id, message_id)
-        if cache_key in self._reference_fetch_cache:
-            return self._reference_fetch_cache[cache_key]
+        guild_id = self.field_value(self.field_value(message, "guild"), "id")
+        cache_key = self.reference_cache_key(guild_id, channel_id, message_id)
+        cached_result = self._reference_fetch_cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
+        async def fetch_and_cache():
+            # Cached by the shared call itself, since only it knows which images went unscanned.
+            unscanned_images = []
+            result = await self.fetch_referenced_message_content_uncached(
+                message,
+                channel_id,
+                message_id,
+                unscanned_images,
+            )
+            # Text missing shed or failed OCR is not kept, so the next forward of it OCRs again.
+            if unscanned_images:
+                return result
+            # Failures are only kept as long as the failed fetch cache would keep them.
+            ttl_seconds = FAILED_FETCH_CACHE_TTL_SECONDS if result[1] is not None else None
+            self._reference_fetch_cache.set(cache_key, result, ttl_seconds=ttl_seconds)
+            return result
 
+        with self.timed_stage("reference fetch"):
+            return await self._reference_flights.run(cache_key, fetch_and_cache)
+
+    @staticmethod
+    def reference_cache_key(guild_id, channel_id, message_id):
+        # A channel-less reference is searched for within the message's guild, so the guild is
+        # part of its key; otherwise the channel and message ids identify the target.
+        if channel_id:
+            return (channel_id, message_id)
+        return ("guild", guild_id, message_id)
+
+    def invalidate_message_caches(self, guild_id, channel_id, message_id):
+        self._reference_fetch_cache.discard(self.reference_cache_key(guild_id, channel_id, message_id))
+        self._reference_fetch_cache.discard(self.reference_cache_key(guild_id, None, message_id))
+        self._message_refetch_cache.discard((channel_id, message_id))
+        self._failed_fetch_cache.discard(("message", channel_id, message_id))
+
+    async def fetch_referenced_message_content_uncached(
+        self,
+        message: discord.Message,
+        channel_id,
+        message_id,
+        unscanned_images: list | None = None,
+    ) -> tuple[str, str | None]:
         if not channel_id:
-            result = await self.fetch_referenced_message_from_guild(message, message_id)
-            self._reference_fetch_cache[cache_key] = result
-            return result
+            return await self.fetch_referenced_message_from_guild(message, message_id, unscanned_images=unscanned_images)
 
         exact_error = None
         channel = self.bot.get_channel(channel_id)
@@ -1019,30 +2477,29 @@ class DoxxingDetector(commands.Cog):
             if fetch_channel is None:
                 exact_error = f"Could not find referenced channel `{channel_id}`."
             else:
-                try:
-                    channel = await fetch_channel(channel_id)
-                except discord.Forbidden:
-                    exact_error = f"Missing permission to fetch referenced channel `{channel_id}`."
-                except discord.NotFound:
-                    exact_error = f"Referenced channel `{channel_id}` was not found."
-                except discord.HTTPException as exc:
-                    exact_error = f"Failed to fetch referenced channel `{channel_id}`: {exc}"
+                channel, failure = await self.fetch_or_cached_failure(fetch_channel, channel_id, ("channel", channel_id))
+                if failure is not None:
+                    kind, detail = failure
+                    if kind == "forbidden":
+                        exact_error = f"Missing permission to fetch referenced channel `{channel_id}`."
+                    elif kind == "not found":
+                        exact_error = f"Referenced channel `{channel_id}` was not found."
+                    else:
+                        exact_error = f"Failed to fetch referenced channel `{channel_id}`: {detail}"
 
         if channel is not None:
-            result = await self.fetch_message_content_from_channel(channel, channel_id, message_id)
+            result = await self.fetch_message_content_from_channel(channel, channel_id, message_id, unscanned_images)
             if result[1] is None:
-                self._reference_fetch_cache[cache_key] = result
                 return result
             exact_error = result[1]
 
-        result = await self.fetch_referenced_message_from_guild(
+        return await self.fetch_referenced_message_from_guild(
             message,
             message_id,
             skip_channel_ids={channel_id},
             prior_error=exact_error,
+            unscanned_images=unscanned_images,
         )
-        self._reference_fetch_cache[cache_key] = result
-        return result
 
     async def fetch_referenced_message_from_guild(
         self,
@@ -1050,12 +2507,27 @@ class DoxxingDetector(commands.Cog):
         message_id: int,
         skip_channel_ids: set[int] | None = None,
         prior_error: str | None = None,
+        unscanned_images: list | None = None,
     ) -> tuple[str, str | None]:
         guild = self.field_value(message, "guild")
         if guild is None:
             return "", prior_error or "Reference is missing channel_id and the message has no guild."
 
         checked_channel_ids = set(skip_channel_ids or [])
+        indexed_channel_id = self._message_locations.channel_id(self.field_value(guild, "id"), message_id)
+        if indexed_channel_id is not None and indexed_channel_id not in checked_channel_ids:
+            checked_channel_ids.add(indexed_channel_id)
+            indexed_channel = self.guild_channel(guild, indexed_channel_id)
+            if indexed_channel is not None:
+                content, error = await self.fetch_message_content_from_channel(
+                    indexed_channel,
+                    indexed_channel_id,
+                    message_id,
+                    unscanned_images,
+                )
+                if error is None:
+                    return content, None
+
         channels = []
         channels.extend(self.sequence_field(guild, "text_channels"))
         channels.extend(self.sequence_field(guild, "threads"))
@@ -1065,23 +2537,22 @@ class DoxxingDetector(commands.Cog):
             if hasattr(channel, "fetch_message")
         )
 
-        fetch_errors = []
+        sweep_channels = []
         for channel in channels:
             channel_id = self.field_value(channel, "id")
             if channel_id in checked_channel_ids:
                 continue
             checked_channel_ids.add(channel_id)
+            if getattr(channel, "fetch_message", None) is not None:
+                sweep_channels.append(channel)
 
-            fetch_message = getattr(channel, "fetch_message", None)
-            if fetch_message is None:
-                continue
-
-            content, error = await self.fetch_message_content_from_channel(channel, channel_id, message_id)
-            if error is None:
-                return content, None
-            if "not found" not in error and "Missing permission" not in error:
-                fetch_errors.append(error)
-                continue
+        content, fetch_errors = await self.sweep_channels_for_message(
+            self.sweep_order(sweep_channels, message_id),
+            message_id,
+            unscanned_images,
+        )
+        if content is not None:
+            return content, None
 
         if fetch_errors:
             return "", f"Could not load referenced message `{message_id}` from guild channels: {'; '.join(fetch_errors)[:900]}"
@@ -1089,6 +2560,97 @@ class DoxxingDetector(commands.Cog):
             return "", f"{prior_error}; referenced message `{message_id}` was not found in any other readable guild channel."
         return "", f"Referenced message `{message_id}` was not found in any readable guild channel."
 
+    @classmethod
+    def sweep_order(cls, channels: list, message_id: int) -> list:
+        """Order channels so the likeliest homes of a message are probed first.
+
+        Snowflakes sort by creation time: a channel created after the message cannot hold it, and
+        channels with the newest last message are the most active.
+        """
+
+        def sort_key(channel):
+            channel_id = cls.field_value(channel, "id") or 0
+            last_message_id = cls.field_value(channel, "last_message_id") or 0
+            return (channel_id > message_id, -last_message_id)
+
+        return sorted(channels, key=sort_key)
+
+    async def sweep_channels_for_message(
+        self,
+        channels: list,
+        message_id: int,
+        unscanned_images: list | None = None,
+    ) -> tuple[str | None, list[str]]:
+        """Probe channels for a message with bounded concurrency, stopping at the first hit.
+
+        discord.py queues each request on its own per-route bucket, and fetch_message routes are
+        keyed by channel, so the concurrency limit is what keeps the sweep clear of the global
+        limit. The sweep gives up after REFERENCE_SWEEP_TIME_BUDGET_SECONDS.
+        """
+        found = []
+        fetch_errors = []
+        remaining_channels = iter(channels)
+        probes = 0
+
+        async def probe_channels():
+            nonlocal probes
+            for channel in remaining_channels:
+                probes += 1
+                channel_id = self.field_value(channel, "id")
+                content, error = await self.fetch_message_content_from_channel(
+                    channel,
+                    channel_id,
+                    message_id,
+                    unscanned_images,
+                )
+                if error is None:
+                    found.append(content)
+                    return
+                if "not found" not in error and "Missing permission" not in error:
+                    fetch_errors.append(error)
+
+        started_at = time.monotonic()
+        deadline = started_at + REFERENCE_SWEEP_TIME_BUDGET_SECONDS
+        pending = {
+            asyncio.ensure_future(probe_channels())
+            for _ in range(min(REFERENCE_SWEEP_CONCURRENCY, len(channels)))
+        }
+        try:
+            while pending and not found:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, deadline - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    self._reference_sweep_counts["out of time"] += 1
+                    fetch_errors.append(
+                        f"Guild search stopped after {REFERENCE_SWEEP_TIME_BUDGET_SECONDS} seconds and {probes} channels."
+                    )
+                    break
+                for task in done:
+                    task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            self._reference_sweep_counts["sweeps"] += 1
+            self._reference_sweep_counts["probes"] += probes
+            self._reference_sweep_counts["hits"] += bool(found)
+            self._reference_sweep_counts["seconds"] += time.monotonic() - started_at
+
+        return (found[0] if found else None), fetch_errors
+
+    def reference_sweep_stats_text(self) -> str:
+        sweeps = self._reference_sweep_counts["sweeps"]
+        if not sweeps:
+            return "no sweeps yet"
+        return (
+            f"{sweeps} sweeps, {self._reference_sweep_counts['hits']} found, "
+            f"{self._reference_sweep_counts['out of time']} out of time, "
+            f"{self._reference_sweep_counts['probes'] / sweeps:.1f} channels probed avg, "
+            f"{self._reference_sweep_counts['seconds'] / sweeps:.2f}s avg"
+        )
+
     async def fetch_forwarded_message_content(self, message: discord.Message) -> str:
         reference = self.field_value(message, "reference")
         if reference is None or not self.is_forward_reference(reference):
@@ -1097,14 +2659,91 @@ class DoxxingDetector(commands.Cog):
         content, _error = await self.fetch_referenced_message_content(message)
         return content
 
-    async def message_search_content_with_forward_fetch(self, message: discord.Message) -> str:
+    async def message_search_content_with_forward_fetch(
+        self,
+        message: discord.Message,
+        stop_on_match: bool = False,
+    ) -> str:
+        return (await self.build_scan_result(message, stop_on_match)).content
+
+    async def scan_message(self, message: discord.Message) -> ScanResult:
+        """Build the staged scan result for a message and record what it matched."""
+        started_at = time.perf_counter()
+        scan_result = await self.build_scan_result(message, stop_on_match=True)
+        matched_at = time.perf_counter()
+        scan_result.match_types = self.scan_doxxing_types(scan_result.content)
+        scan_result.timings["match"] = time.perf_counter() - matched_at
+        scan_result.timings["total"] = time.perf_counter() - started_at
+        self.record_scan()
+        self.record_stage_latency(
+            "regex scan",
+            scan_result.timings.get("plain text", 0.0) + scan_result.timings["match"],
+        )
+        if "ocr and fetch" in scan_result.timings:
+            self.record_stage_latency("ocr and fetch", scan_result.timings["ocr and fetch"])
+        self.record_stage_latency("scan total", scan_result.timings["total"])
+        return scan_result
+
+    async def build_scan_result(self, message: discord.Message, stop_on_match: bool = False) -> ScanResult:
+        """Collect a message's searchable text, including OCR and fetched forwards.
+
+        With stop_on_match the scan is staged: plain text is checked before any OCR or fetch starts,
+        and once any stage finds PII the outstanding OCR and fetches are cancelled. The parts returned
+        then hold all of the plain text but only the OCR and fetch results finished by the match.
+        """
         if not self.has_message_content_intent():
             await self.warn_missing_message_content_intent(getattr(message, "guild", None))
 
-        content = await self.async_message_search_content(message)
-        refetched_content = ""
-        if self.may_need_current_message_refetch(message):
-            refetched_content, _error = await self.fetch_current_message_content(message)
+        if stop_on_match:
+            started_at = time.perf_counter()
+            scan_result = ScanResult()
+            matched = False
+            for source, text, _image in self.message_segments(message):
+                if text:
+                    scan_result.parts.append((source, text))
+                    if self.find_doxxing_types(text):
+                        matched = True
+                        break
+            # A match can also span parts, so the joined text is checked when no single part matched.
+            if not matched and len(scan_result.parts) > 1:
+                matched = bool(self.find_doxxing_types(scan_result.content))
+            scan_result.timings["plain text"] = time.perf_counter() - started_at
+            if matched:
+                self._ocr_counts["text verdicts"] += 1
+                await self.log_forward_debug(message, scan_result.content)
+                return scan_result
+
+        started_at = time.perf_counter()
+        shed_images = []
+        content_parts = []
+        content_task = asyncio.ensure_future(
+            self.async_message_search_parts(
+                message,
+                stop_on_match=stop_on_match,
+                shed_images=shed_images,
+                parts=content_parts,
+            )
+        )
+        fetch_task = asyncio.ensure_future(self.forward_fetch_parts(message))
+        try:
+            if stop_on_match:
+                done, _pending = await asyncio.wait({content_task, fetch_task}, return_when=asyncio.FIRST_COMPLETED)
+                if any(self.find_doxxing_types(text) for task in done for _source, text in task.result()):
+                    content_task.cancel()
+                    fetch_task.cancel()
+            results = await asyncio.gather(content_task, fetch_task, return_exceptions=True)
+        finally:
+            content_task.cancel()
+            fetch_task.cancel()
+        content_result, fetch_result = results
+        self.completed_parts(content_result)
+        # Read from the in-place list, so a fetch match that cancels the OCR keeps the text parts.
+        scan_result = ScanResult(
+            [(source, text) for source, text in content_parts if text] + self.completed_parts(fetch_result)
+        )
+        scan_result.shed_images = len(shed_images)
+        scan_result.timings["ocr and fetch"] = time.perf_counter() - started_at
+
         snapshots = self.forward_snapshots(message)
         if (
             snapshots
@@ -1124,12 +2763,28 @@ class DoxxingDetector(commands.Cog):
             )
             await self.send_log_embed(embed, getattr(message, "guild", None))
 
-        fetched_content = ""
-        if not refetched_content and self.needs_reference_fetch_for_scan(message):
+        await self.log_forward_debug(message, scan_result.content)
+        return scan_result
+
+    @staticmethod
+    def completed_parts(result) -> list[tuple[str, str]]:
+        if isinstance(result, asyncio.CancelledError):
+            return []
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def forward_fetch_parts(self, message: discord.Message) -> list[tuple[str, str]]:
+        if self.may_need_current_message_refetch(message):
+            refetched_content, _error = await self.fetch_current_message_content(message)
+            if refetched_content:
+                return [("refetched message", refetched_content)]
+
+        if self.needs_reference_fetch_for_scan(message):
             fetched_content, _error = await self.fetch_referenced_message_content(message)
-        searchable_content = "\n".join(part for part in [content, refetched_content, fetched_content] if part)
-        await self.log_forward_debug(message, searchable_content)
-        return searchable_content
+            if fetched_content:
+                return [("fetched reference", fetched_content)]
+        return []
 
     async def unresolved_reference_error(self, message: discord.Message) -> str | None:
         if self.may_need_current_message_refetch(message):
@@ -1166,6 +2821,26 @@ class DoxxingDetector(commands.Cog):
 
         await self.log_unscannable_reference(message, deleted, "; ".join(errors))
 
+    async def delete_unscanned_image_message(self, message: discord.Message, shed_images: int) -> None:
+        deleted, delete_error = await self.delete_message(message)
+        channel = self.field_value(message, "channel")
+        embed = discord.Embed(
+            title="Message removed for review",
+            description=(
+                f"The OCR queue was full, so {shed_images} image(s) in this message were not scanned. "
+                "Review the message and repost it if it is safe."
+            ),
+            color=discord.Color.orange(),
+            timestamp=discord.utils.utcnow(),
+        )
+        embed.add_field(name="User", value=f"{message.author.mention} (`{message.author.id}`)", inline=False)
+        embed.add_field(name="Channel", value=self.field_value(channel, "mention", str(self.field_value(channel, "id", ""))), inline=True)
+        embed.add_field(name="Deleted", value="Yes" if deleted else "No", inline=True)
+        embed.add_field(name="Message", value=self.spoiler_text(self.field_value(message, "content", "")), inline=False)
+        if delete_error:
+            embed.add_field(name="Error", value=delete_error[:1024], inline=False)
+        await self.send_log_embed(embed, message.guild)
+
     @staticmethod
     async def delete_message(message: discord.Message) -> tuple[bool, str | None]:
         try:
@@ -1194,10 +2869,62 @@ class DoxxingDetector(commands.Cog):
             return f"Failed to DM the user: {exc}"
         return None
 
+    async def apply_detection_actions(
+        self,
+        message: discord.Message,
+        deleted: bool = False,
+        delete_error: str | None = None,
+    ) -> tuple[bool, bool, bool, list[str]]:
+        """Delete a detected message first, then DM and time out its author concurrently.
+
+        The message leaves the channel before any other request is made. Returns deleted,
+        timed_out, dm_sent and the errors for the detection log, in that order.
+        """
+        errors = [delete_error] if delete_error else []
+        if not deleted:
+            with self.timed_stage("delete"):
+                deleted, delete_error = await self.delete_message(message)
+            if delete_error:
+                errors.append(delete_error)
+
+        (dm_sent, dm_error), (timed_out, timeout_error) = await asyncio.gather(
+            self.dm_detected_author(message),
+            self.timeout_detected_author(message),
+        )
+        errors.extend(error for error in (dm_error, timeout_error) if error)
+        return deleted, timed_out, dm_sent, errors
+
+    async def dm_detected_author(self, message: discord.Message) -> tuple[bool, str | None]:
+        if message.author.bot:
+            return False, "Skipped DM because the forwarded message was authored by a bot."
+        with self.timed_stage("dm"):
+            dm_error = await self.notify_author(message)
+        return dm_error is None, dm_error
+
+    async def timeout_detected_author(self, message: discord.Message) -> tuple[bool, str | None]:
+        if message.author.bot:
+            return False, "Skipped timeout because the forwarded message was authored by a bot."
+        me = message.guild.me or message.guild.get_member(self.bot.user.id)
+        if not me or not self.can_timeout(message.author, me):
+            return False, "Cannot timeout this user due to permissions or role hierarchy."
+
+        until = discord.utils.utcnow() + TIMEOUT_DURATION
+        try:
+            with self.timed_stage("timeout"):
+                await message.author.timeout(
+                    until,
+                    reason="Posted likely private personal information.",
+                )
+        except discord.Forbidden:
+            return False, "Missing permission or role hierarchy to timeout the user."
+        except discord.HTTPException as exc:
+            return False, f"Failed to timeout user: {exc}"
+        return True, None
+
     async def log_detection(
         self,
         message: discord.Message,
-        match_types: list[str],
+        scan_result: ScanResult,
         deleted: bool,
         timed_out: bool,
         dm_sent: bool,
@@ -1218,15 +2945,16 @@ class DoxxingDetector(commands.Cog):
         )
         embed.add_field(name="User", value=f"{message.author.mention} (`{message.author.id}`)", inline=False)
         embed.add_field(name="Channel", value=message.channel.mention, inline=True)
-        embed.add_field(name="Detected", value=", ".join(match_types), inline=True)
+        embed.add_field(name="Detected", value=", ".join(scan_result.match_types), inline=True)
         embed.add_field(name="Deleted", value="Yes" if deleted else "No", inline=True)
         embed.add_field(name="Timed out", value="Yes" if timed_out else "No", inline=True)
         embed.add_field(name="DM sent", value="Yes" if dm_sent else "No", inline=True)
         embed.add_field(
             name="Message",
-            value=self.spoiler_text(await self.message_search_content_with_forward_fetch(message)),
+            value=self.spoiler_text(scan_result.content),
             inline=False,
         )
+        embed.add_field(name="Scanned", value=", ".join(scan_result.sources) or "nothing", inline=False)
         if error:
             embed.add_field(name="Error", value=error[:1024], inline=False)
 
@@ -1277,18 +3005,24 @@ class DoxxingDetector(commands.Cog):
     async def on_message(self, message: discord.Message):
         if message.guild is None:
             return
+        async with self._message_scans.hold(self.field_value(message, "id")):
+            await self.scan_and_act_on_message(message)
+
+    async def scan_and_act_on_message(self, message: discord.Message):
+        """Scan a guild message and act on what it matched; callers hold its _message_scans lock."""
+        message = MessageView(message)
+        self.index_message_location(message)
 
         deleted = False
         delete_error = None
         if await self.should_delete_forward_from_outside_server(message):
-            deleted, delete_error = await self.delete_message(message)
-            searchable_content = await self.message_search_content_with_forward_fetch(message)
-            match_types = self.find_doxxing_types(searchable_content)
-            if not match_types:
+            with self.timed_stage("delete"):
+                deleted, delete_error = await self.delete_message(message)
+            scan_result = await self.scan_message(message)
+            if not scan_result.match_types:
                 return
         else:
-            searchable_content = None
-            match_types = None
+            scan_result = None
 
         is_forward_message = self.is_forward_message(message)
         is_reference_like_message = self.is_reference_like_message(message)
@@ -1297,55 +3031,24 @@ class DoxxingDetector(commands.Cog):
         if not isinstance(message.author, discord.Member) and not is_forward_message and not is_reference_like_message:
             return
 
-        if searchable_content is None:
-            searchable_content = await self.message_search_content_with_forward_fetch(message)
-        if match_types is None:
-            match_types = self.find_doxxing_types(searchable_content)
-        if not match_types:
+        if scan_result is None:
+            scan_result = await self.scan_message(message)
+        message_id = self.field_value(message, "id")
+        if message_id:
+            self._edit_scan_records.set(message_id, (self.scan_content_hash(message), bool(scan_result.match_types)))
+        if not scan_result.match_types:
+            if scan_result.shed_images and OCR_QUEUE_SHED_POLICY == "delete and review":
+                await self.delete_unscanned_image_message(message, scan_result.shed_images)
+                return
             unresolved_reference_error = await self.unresolved_reference_error(message)
             if unresolved_reference_error:
                 await self.delete_unscannable_reference_message(message, unresolved_reference_error)
             return
 
-        timed_out = False
-        dm_sent = False
-        errors = [delete_error] if delete_error else []
-
-        if message.author.bot:
-            errors.append("Skipped DM because the forwarded message was authored by a bot.")
-        else:
-            dm_error = await self.notify_author(message)
-            if dm_error:
-                errors.append(dm_error)
-            else:
-                dm_sent = True
-
-        if not deleted:
-            deleted, delete_error = await self.delete_message(message)
-            if delete_error:
-                errors.append(delete_error)
-
-        me = message.guild.me or message.guild.get_member(self.bot.user.id)
-        if message.author.bot:
-            errors.append("Skipped timeout because the forwarded message was authored by a bot.")
-        elif me and self.can_timeout(message.author, me):
-            until = discord.utils.utcnow() + TIMEOUT_DURATION
-            try:
-                await message.author.timeout(
-                    until,
-                    reason="Posted likely private personal information.",
-                )
-                timed_out = True
-            except discord.Forbidden:
-                errors.append("Missing permission or role hierarchy to timeout the user.")
-            except discord.HTTPException as exc:
-                errors.append(f"Failed to timeout user: {exc}")
-        else:
-            errors.append("Cannot timeout this user due to permissions or role hierarchy.")
-
+        deleted, timed_out, dm_sent, errors = await self.apply_detection_actions(message, deleted, delete_error)
         await self.log_detection(
             message,
-            match_types,
+            scan_result,
             deleted,
             timed_out,
             dm_sent,
@@ -1353,5 +3056,15 @@ class DoxxingDetector(commands.Cog):
         )
 
 
+@functools.lru_cache(maxsize=1)
+def process_ocr_engine():
+    return DoxxingDetector.load_ocr_engine()
+
+
+def process_image_text(image_bytes: bytes) -> tuple[str, dict]:
+    """OCR entry point for process-pool workers, which each keep their own engine."""
+    return DoxxingDetector.engine_image_text(process_ocr_engine(), image_bytes)
+
+
 async def setup(bot):
     await bot.add_cog(DoxxingDetector(bot))
@@ -0,0 +1,129 @@
+"""Replay a JSONL message dump through the doxxing detector.
+
+Run from the repository root:
+
+    python -m doxxing_detector.replay messages.jsonl [--output verdicts.jsonl] [--workers N]
+
+Each input line is one message as a dict, with content, embeds, attachments and
+message_snapshots in the shapes DoxxingDetector.field_value already reads. The dump is read in
+batches and scanned across a process pool with a bounded number of batches in flight, so memory
+stays flat however long the dump is. One verdict per message is written as JSONL, in input order,
+and aggregate counts are printed to stderr at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+
+from .doxxing_detector import DOXXING_TYPES, DoxxingDetector
+
+
+REPLAY_BATCH_SIZE = 256
+# Batches queued per worker; enough to keep workers busy without reading ahead into the dump.
+REPLAY_BATCHES_PER_WORKER = 2
+
+
+def scan_line(line_number: int, line: str) -> dict:
+    try:
+        message = json.loads(line)
+    except json.JSONDecodeError as exc:
+        return {"line": line_number, "error": f"Invalid JSON: {exc}"}
+    if not isinstance(message, dict):
+        return {"line": line_number, "error": "Line is not a JSON object."}
+
+    content = DoxxingDetector.message_search_content(message)
+    return {
+        "line": line_number,
+        "id": message.get("id"),
+        "types": DoxxingDetector.find_doxxing_types(content),
+    }
+
+
+def scan_batch(batch: list[tuple[int, str]]) -> list[dict]:
+    """Process-pool entry point: scan one batch of numbered lines."""
+    return [scan_line(line_number, line) for line_number, line in batch]
+
+
+def numbered_batches(lines, batch_size: int):
+    numbered = ((line_number, line) for line_number, line in enumerate(lines, start=1) if line.strip())
+    while batch := list(itertools.islice(numbered, batch_size)):
+        yield batch
+
+
+def replay_verdicts(lines, workers: int = 0, batch_size: int = REPLAY_BATCH_SIZE):
+    """Yield a verdict for every non-blank line, in input order.
+
+    With workers set to 0 the batches are scanned in this process.
+    """
+    batches = numbered_batches(lines, batch_size)
+    if workers <= 0:
+        for batch in batches:
+            yield from scan_batch(batch)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for batch in batches:
+            pending.append(executor.submit(scan_batch, batch))
+            if len(pending) >= workers * REPLAY_BATCHES_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def replay(lines, output, workers: int = 0, batch_size: int = REPLAY_BATCH_SIZE, only_matches: bool = False):
+    """Write verdicts for a dump to output and return the aggregate counts."""
+    counts = collections.Counter()
+    for verdict in replay_verdicts(lines, workers, batch_size):
+        if "error" in verdict:
+            counts["errors"] += 1
+        else:
+            counts["messages"] += 1
+            counts["matched"] += bool(verdict["types"])
+            counts.update(verdict["types"])
+        if not only_matches or verdict.get("types") or "error" in verdict:
+            output.write(json.dumps(verdict) + "\n")
+    return counts
+
+
+def summary_text(counts: collections.Counter) -> str:
+    lines = [
+        f"Messages scanned: {counts['messages']}",
+        f"Messages matched: {counts['matched']}",
+    ]
+    lines.extend(f"Matched {match_type}: {counts[match_type]}" for match_type in DOXXING_TYPES)
+    lines.append(f"Unreadable lines: {counts['errors']}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a JSONL message dump through the doxxing detector.")
+    parser.add_argument("dump", help="JSONL file with one message per line, or - for stdin")
+    parser.add_argument("--output", default="-", help="where to write verdict JSONL (default: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes; 0 scans in-process")
+    parser.add_argument("--batch-size", type=int, default=REPLAY_BATCH_SIZE)
+    parser.add_argument("--only-matches", action="store_true", help="only write verdicts that matched or failed")
+    args = parser.parse_args(argv)
+
+    dump = sys.stdin if args.dump == "-" else open(args.dump, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        counts = replay(dump, output, args.workers, args.batch_size, args.only_matches)
+    finally:
+        if dump is not sys.stdin:
+            dump.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(summary_text(counts), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,43 @@
 import asyncio
 import unittest
 import datetime
+import importlib.util
+import io
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
 from types import SimpleNamespace
+from unittest import mock
 
 import discord
 
+from doxxing_detector import doxxing_detector as doxxing_detector_module
 from doxxing_detector.doxxing_detector import (
     ALWAYS_DELETE_FORWARD_ROLE_IDS,
     AUTO_FLAG_DM,
+    BoundedCache,
+    DOXXING_TYPES,
     DoxxingDetector,
     EXEMPT_FORWARD_SOURCE_CHANNEL_IDS,
     EXEMPT_ROLE_IDS,
     FORWARD_SOURCE_GUILD_ID,
+    LatencyHistogram,
     LOG_CHANNEL_ID,
+    MAX_CONCURRENT_MESSAGE_OCR,
+    MessageLocationIndex,
+    MessageView,
+    OCR_CROP_SAMPLE_FACTOR,
+    OcrExecutor,
+    OcrFailed,
+    OcrJobQueue,
+    OcrQueueFull,
+    REFERENCE_SWEEP_CONCURRENCY,
+    SingleFlight,
     TesseractOcrEngine,
+    TesserocrOcrEngine,
     TIMEOUT_DURATION,
 )
 
@@ -132,6 +156,53 @@ class DoxxingDetectorTest(unittest.TestCase):
 
         self.assertIn("phone number", DoxxingDetector.find_doxxing_types(content))
 
+    def test_overlapping_neutral_tokens_are_blanked_in_order(self):
+        examples = [
+            # The video timestamp is blanked before the game score that would swallow the phone number.
+            ("4567 @ v v 123 555-123-4567 vs 12:30:00", ["phone number"]),
+            # The Discord timestamp goes first, so no video timestamp or score is left inside it.
+            ("<t:1700000000:R> v 3", []),
+            # Blanking leaves a space, so the words around a token can still form an address.
+            ("1234 Example 1:45 Street", ["address"]),
+        ]
+
+        for content, expected in examples:
+            with self.subTest(content=content):
+                self.assertEqual(DoxxingDetector.find_doxxing_types(content), expected)
+                self.assertEqual(DoxxingDetector.find_doxxing_types(content, DOXXING_TYPES), expected)
+
+    def test_scan_matches_the_blank_then_search_pipeline(self):
+        def blank_then_search(content):
+            searchable = content
+            for neutral_pattern, flags in (
+                (r"<t:\d{1,12}(?::[A-Za-z])?>", 0),
+                (r"(?<!\w)\d{1,2}:\d{2}(?::\d{2})?(?!\w)", 0),
+                (r"\b\d+\s*v(?:s\.?|ersus)?\s*\d+\b", re.IGNORECASE),
+                (r"(?<!\w)\d{1,2}/10(?!\w)", 0),
+            ):
+                searchable = re.sub(neutral_pattern, " ", searchable, flags=flags)
+            searchable = DoxxingDetector.strip_http_urls(searchable)
+            matches = []
+            if doxxing_detector_module.EMAIL_RE.search(searchable):
+                matches.append("email")
+            if doxxing_detector_module.PHONE_RE.search(DoxxingDetector.strip_file_tokens(searchable)):
+                matches.append("phone number")
+            if DoxxingDetector.has_address(searchable):
+                matches.append("address")
+            return matches
+
+        tokens = (
+            "12 1234 42 555 4567 123 ١٢٣ 3-2 10/10 9/10 1:45 12:30:00 1:02:33 v vs vs. versus VS "
+            "<t:1700000000:R> <t:17:R> https://x.com/1 http://a.b/555-123-4567 Main Street St. Ave, way "
+            "place pl. apt unit the my Oak Elm @ a@b.co x@y.com 555-123-4567 (555) 123 4567 IMG_2024.png "
+            "file.jpg 123456 1234567 :"
+        ).split()
+        separators = [" ", " ", "", "\n", "\t", ", ", "/", ":"]
+        rng = random.Random(1234)
+        for _ in range(5000):
+            content = "".join(rng.choice(tokens) + rng.choice(separators) for _ in range(rng.randint(1, 12)))
+            self.assertEqual(DoxxingDetector.find_doxxing_types(content), blank_then_search(content), content)
+
     def test_ad_tracking_url_is_not_a_phone_number(self):
         content = (
             "https://mycarpe.com/products/clinical-grade-antiperspirant-underarm-regimen?"
@@ -175,12 +246,113 @@ class DoxxingDetectorTest(unittest.TestCase):
 
         self.assertIn("phone number", DoxxingDetector.find_doxxing_types(content))
 
+    def test_email_inside_url_is_not_an_email(self):
+        content = "https://example.com/share?to=person@example.com"
+
+        self.assertEqual(DoxxingDetector.find_doxxing_types(content), [])
+
+    def test_user_mention_is_not_an_email_or_phone_number(self):
+        self.assertEqual(DoxxingDetector.find_doxxing_types("hey <@1481877137118990420> @everyone"), [])
+
+    def test_phone_number_spanning_attachment_filename_is_not_detected(self):
+        self.assertEqual(DoxxingDetector.find_doxxing_types("555 123 4567.png"), [])
+
+    def test_detects_every_type_in_one_message(self):
+        content = "person@example.com or 555-123-4567, I live at 123 Main Street"
+
+        self.assertEqual(
+            DoxxingDetector.find_doxxing_types(content),
+            ["email", "phone number", "address"],
+        )
+
+    def test_detects_phone_number_written_with_fullwidth_digits(self):
+        content = "call \uff15\uff15\uff15-\uff11\uff12\uff13-\uff14\uff15\uff16\uff17"
+
+        self.assertEqual(DoxxingDetector.find_doxxing_types(content), ["phone number"])
+
+    def test_detects_pii_written_with_non_ascii_digits(self):
+        examples = {
+            "\u0661\u0662\u0663 Main Street": ["address"],
+            "call \u0665\u0665\u0665-\u0661\u0662\u0663-\u0664\u0665\u0666\u0667": ["phone number"],
+        }
+
+        for content, expected in examples.items():
+            with self.subTest(content=content):
+                self.assertEqual(DoxxingDetector.find_doxxing_types(content), expected)
+                self.assertEqual(DoxxingDetector.find_doxxing_types(content, DOXXING_TYPES), expected)
+
+    def test_prefilter_skips_detectors_that_cannot_match(self):
+        self.assertEqual(DoxxingDetector.possible_doxxing_types("lol that was funny"), ())
+        self.assertEqual(DoxxingDetector.possible_doxxing_types("ping @everyone"), ("email",))
+        self.assertEqual(DoxxingDetector.possible_doxxing_types("I have 4 dogs"), ("address",))
+        self.assertEqual(
+            DoxxingDetector.possible_doxxing_types("call 555-123-4567"),
+            ("phone number", "address"),
+        )
+        self.assertEqual(
+            DoxxingDetector.possible_doxxing_types("call \u0665\u0665\u0665-\u0661\u0662\u0663-\u0664\u0665\u0666"),
+            ("address",),
+        )
+        self.assertEqual(
+            DoxxingDetector.possible_doxxing_types("123 Main St."),
+            ("address",),
+        )
+
+    def test_prefilter_does_not_change_scan_results(self):
+        examples = [
+            "person@example.com or 555-123-4567, I live at 123 Main Street",
+            "call \uff15\uff15\uff15-\uff11\uff12\uff13-\uff14\uff15\uff16\uff17",
+            "456 River Way \U0001F600",
+            "i have 4 hours left on the road",
+        ]
+
+        for content in examples:
+            with self.subTest(content=content):
+                self.assertEqual(
+                    DoxxingDetector.find_doxxing_types(content),
+                    DoxxingDetector.find_doxxing_types(content, DOXXING_TYPES),
+                )
+
+    def test_scan_doxxing_types_counts_prefilter_rejections(self):
+        detector = DoxxingDetector(SimpleNamespace())
+
+        detector.scan_doxxing_types("lol that was funny")
+        detector.scan_doxxing_types("call me at 555-123-4567")
+        report = detector.scan_stats_report()
+
+        self.assertIn("Messages scanned: 2", report)
+        self.assertIn("Pre-filter skipped every detector: 1 (50.0%)", report)
+        self.assertIn("Pre-filter skipped email: 2 (100.0%)", report)
+        self.assertIn("Pre-filter skipped phone number: 1 (50.0%)", report)
+        self.assertIn("Pre-filter skipped address: 1 (50.0%)", report)
+
     def test_detects_common_address_formats(self):
         self.assertIn("address", DoxxingDetector.find_doxxing_types("123 Main Street"))
         self.assertIn("address", DoxxingDetector.find_doxxing_types("123 Oak Place"))
         self.assertIn("address", DoxxingDetector.find_doxxing_types("456 River Way"))
         self.assertIn("address", DoxxingDetector.find_doxxing_types("45 River Way"))
 
+    def test_address_scan_stops_after_last_suffix_word(self):
+        self.assertEqual(DoxxingDetector.last_suffix_word_start("score 1 2 3 4 5 6 7 8 9 the end"), 0)
+        self.assertEqual(DoxxingDetector.last_suffix_word_start("12 Main St. then 42 Oak Ave"), 24)
+        self.assertEqual(DoxxingDetector.last_suffix_word_start("12 Main \u017ft"), 10)
+        self.assertEqual(DoxxingDetector.last_suffix_word_start("42 Oak Ave " + "x " * 200), 7)
+        self.assertEqual(DoxxingDetector.last_suffix_word_start("x " * 200 + "42 Oak Ave"), 407)
+
+        kills = "went " + " ".join(f"{count} kills" for count in range(1, 11))
+        for content, expected_types, expected_starts in (
+            (kills + " in 3 games", [], []),
+            (kills + ", then 1234 Example Street", ["address"], [5, 13, 21, 29, 37, 45, 53, 61, 69, 77, 92]),
+            ("send it to 1234 Example Street, then 3 kills", ["address"], [11]),
+        ):
+            with self.subTest(content=content):
+                address_re = mock.Mock(wraps=doxxing_detector_module.ADDRESS_RE)
+                with mock.patch.object(doxxing_detector_module, "ADDRESS_RE", address_re):
+                    types = DoxxingDetector.find_doxxing_types(content, DOXXING_TYPES)
+
+                self.assertEqual(types, expected_types)
+                self.assertEqual([call.args[1] for call in address_re.match.call_args_list], expected_starts)
+
     def test_search_content_includes_forwarded_message_snapshot_text(self):
         message = SimpleNamespace(
             content="",
@@ -378,16 +550,13 @@ class DoxxingDetectorTest(unittest.TestCase):
             )
         )
 
-    def test_image_bytes_to_text_passes_temp_file_path_to_ocr(self):
+    def test_image_bytes_to_text_passes_bytes_to_ocr_engine(self):
         image_bytes = b"fake image"
-        ocr_paths = []
-        test_case = self
+        ocr_inputs = []
 
         class FakeOcrEngine:
-            def image_to_text(self, image_path):
-                ocr_paths.append(image_path)
-                with open(image_path, "rb") as image_file:
-                    test_case.assertEqual(image_file.read(), image_bytes)
+            def image_to_text(self, image):
+                ocr_inputs.append(image)
                 return "parsed text"
 
         detector = DoxxingDetector(SimpleNamespace())
@@ -396,7 +565,7 @@ class DoxxingDetectorTest(unittest.TestCase):
         text = detector.image_bytes_to_text(image_bytes)
 
         self.assertEqual(text, "parsed text")
-        self.assertEqual(len(ocr_paths), 1)
+        self.assertEqual(ocr_inputs, [image_bytes])
 
     def test_tesseract_ocr_engine_reads_text_with_page_segmentation(self):
         calls = []
@@ -415,6 +584,389 @@ class DoxxingDetectorTest(unittest.TestCase):
         self.assertEqual(text, "parsed text")
         self.assertEqual(calls, [("image.png", "--psm 6")])
 
+    def test_tesseract_ocr_engine_pipes_image_bytes_through_stdin(self):
+        fake_pytesseract = SimpleNamespace(pytesseract=SimpleNamespace(tesseract_cmd=None))
+        completed = subprocess.CompletedProcess([], 0, stdout=b"call 555-123-4567\n", stderr=b"")
+
+        with mock.patch.object(subprocess, "run", return_value=completed) as run:
+            engine = TesseractOcrEngine(fake_pytesseract)
+            text = engine.image_to_text(b"\xff\xd8 jpeg data")
+
+        self.assertEqual(text, "call 555-123-4567\n")
+        args, kwargs = run.call_args
+        self.assertEqual(args[0], [engine.tesseract_cmd, "stdin", "stdout", "--psm", "6"])
+        self.assertEqual(kwargs["input"], b"\xff\xd8 jpeg data")
+
+    def test_tesseract_ocr_engine_encodes_decoded_images_in_memory(self):
+        class FakeImage:
+            def save(self, image_file, format):
+                image_file.write(f"{format} pixels".encode())
+
+        fake_pytesseract = SimpleNamespace(pytesseract=SimpleNamespace(tesseract_cmd=None))
+        completed = subprocess.CompletedProcess([], 0, stdout=b"text", stderr=b"")
+
+        with mock.patch.object(subprocess, "run", return_value=completed) as run:
+            TesseractOcrEngine(fake_pytesseract).image_to_text(FakeImage())
+
+        self.assertEqual(run.call_args.kwargs["input"], b"PNG pixels")
+
+    def test_tesseract_ocr_engine_raises_tesseract_errors(self):
+        fake_pytesseract = SimpleNamespace(pytesseract=SimpleNamespace(tesseract_cmd=None))
+        completed = subprocess.CompletedProcess([], 1, stdout=b"", stderr=b"Error in pixReadMem\n")
+
+        with mock.patch.object(subprocess, "run", return_value=completed):
+            with self.assertRaisesRegex(RuntimeError, "status 1: Error in pixReadMem"):
+                TesseractOcrEngine(fake_pytesseract).image_to_text(b"not an image")
+
+    @staticmethod
+    def fake_tesserocr_modules(created_apis):
+        class FakeApi:
+            def __init__(self, psm):
+                self.psm = psm
+                self.images = []
+                created_apis.append(self)
+
+            def SetImage(self, image):
+                self.images.append(image)
+
+            def GetUTF8Text(self):
+                return f"text from {self.images[-1].name}"
+
+            def Clear(self):
+                pass
+
+        class FakeImage:
+            def __init__(self, name):
+                self.name = name
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+        image_module = SimpleNamespace(open=lambda image_file: FakeImage(image_file.read().decode()))
+        tesserocr_module = SimpleNamespace(PyTessBaseAPI=FakeApi, PSM=SimpleNamespace(SINGLE_BLOCK=6))
+        return tesserocr_module, image_module
+
+    def test_tesserocr_engine_reuses_one_api_per_thread(self):
+        created_apis = []
+        tesserocr_module, image_module = self.fake_tesserocr_modules(created_apis)
+        engine = TesserocrOcrEngine(tesserocr_module, image_module)
+
+        texts = [engine.image_to_text(b"first"), engine.image_to_text(b"second")]
+        worker = threading.Thread(target=engine.image_to_text, args=(b"third",))
+        worker.start()
+        worker.join()
+
+        self.assertEqual(texts, ["text from first", "text from second"])
+        self.assertEqual(len(created_apis), 2)
+        self.assertEqual(created_apis[0].psm, 6)
+        self.assertEqual([image.name for image in created_apis[0].images], ["first", "second"])
+        self.assertEqual([image.name for image in created_apis[1].images], ["third"])
+
+    def test_load_ocr_engine_prefers_tesserocr(self):
+        tesserocr_module, image_module = self.fake_tesserocr_modules([])
+        fake_modules = {
+            "tesserocr": tesserocr_module,
+            "PIL": SimpleNamespace(Image=image_module),
+            "PIL.Image": image_module,
+        }
+
+        with mock.patch.dict(sys.modules, fake_modules):
+            engine = DoxxingDetector.load_ocr_engine()
+
+        self.assertIsInstance(engine, TesserocrOcrEngine)
+
+    def test_load_ocr_engine_falls_back_to_pytesseract(self):
+        fake_pytesseract = SimpleNamespace(pytesseract=SimpleNamespace(tesseract_cmd=None))
+
+        with mock.patch.dict(sys.modules, {"tesserocr": None, "pytesseract": fake_pytesseract}):
+            engine = DoxxingDetector.load_ocr_engine()
+
+        self.assertIsInstance(engine, TesseractOcrEngine)
+
+    def test_ocr_dependency_report_names_active_engine(self):
+        detector = DoxxingDetector(SimpleNamespace())
+        self.assertIn("Active OCR engine: not loaded yet", detector.ocr_dependency_report())
+
+        detector._ocr_engine = TesserocrOcrEngine(*self.fake_tesserocr_modules([]))
+
+        self.assertIn("Active OCR engine: tesserocr", detector.ocr_dependency_report())
+
+    @unittest.skipUnless(importlib.util.find_spec("PIL"), "Pillow is not installed")
+    def test_preprocess_ocr_image_grayscales_and_caps_resolution(self):
+        from PIL import Image
+
+        image_file = io.BytesIO()
+        Image.new("RGB", (1200, 4000), "white").save(image_file, format="PNG")
+
+        with mock.patch.object(doxxing_detector_module, "OCR_MAX_IMAGE_PIXELS", 1_200_000):
+            image, pixels_before, pixels_after = DoxxingDetector.preprocess_ocr_image(image_file.getvalue())
+
+        self.assertEqual(image.mode, "L")
+        self.assertEqual(pixels_before, 4_800_000)
+        self.assertEqual(image.size, (600, 2000))
+        self.assertEqual(pixels_after, 1_200_000)
+
+    @unittest.skipUnless(importlib.util.find_spec("PIL"), "Pillow is not installed")
+    def test_preprocess_ocr_image_flattens_transparency_onto_white(self):
+        from PIL import Image, ImageDraw
+
+        sticker = Image.new("RGBA", (200, 100), (0, 0, 0, 0))
+        ImageDraw.Draw(sticker).rectangle((50, 40, 150, 60), fill=(0, 0, 0, 255))
+        image_file = io.BytesIO()
+        sticker.save(image_file, format="PNG")
+
+        image, _pixels_before, _pixels_after = DoxxingDetector.preprocess_ocr_image(image_file.getvalue())
+
+        self.assertEqual(image.mode, "L")
+        self.assertEqual(image.getpixel((10, 10)), 255)
+        self.assertEqual(image.getpixel((100, 50)), 0)
+
+    @unittest.skipUnless(importlib.util.find_spec("PIL"), "Pillow is not installed")
+    def test_preprocess_ocr_image_keeps_minimum_scale_for_long_screenshots(self):
+        from PIL import Image
+
+        image_file = io.BytesIO()
+        Image.new("L", (1000, 20000), "white").save(image_file, format="PNG")
+
+        image, _pixels_before, _pixels_after = DoxxingDetector.preprocess_ocr_image(image_file.getvalue())
+
+        self.assertEqual(image.size, (500, 10000))
+
+    @unittest.skipUnless(importlib.util.find_spec("PIL"), "Pillow is not installed")
+    def test_preprocess_ocr_image_crops_to_edge_dense_region(self):
+        from PIL import Image, ImageDraw
+
+        image = Image.new("L", (800, 800), "white")
+        ImageDraw.Draw(image).rectangle((300, 350, 500, 420), outline="black", width=3)
+        image_file = io.BytesIO()
+        image.save(image_file, format="PNG")
+
+        with mock.patch.object(doxxing_detector_module, "OCR_CROP_TO_TEXT_REGION", True):
+            cropped, pixels_before, pixels_after = DoxxingDetector.preprocess_ocr_image(image_file.getvalue())
+
+        left, top, right, bottom = (300 - 16, 350 - 16, 500 + 16, 420 + 16)
+        self.assertLessEqual(abs(cropped.width - (right - left)), OCR_CROP_SAMPLE_FACTOR * 4)
+        self.assertLessEqual(abs(cropped.height - (bottom - top)), OCR_CROP_SAMPLE_FACTOR * 4)
+        self.assertEqual(pixels_before, 640_000)
+        self.assertLess(pixels_after, pixels_before / 4)
+
+    def test_message_segments_are_lazy_and_mark_images_for_ocr(self):
+        class LateEmbedsMessage:
+            content = "first"
+            attachments = []
+            message_snapshots = []
+            reference = None
+
+            @property
+            def embeds(self):
+                raise AssertionError("embeds read before they were needed")
+
+        segments = DoxxingDetector.message_segments(LateEmbedsMessage())
+        self.assertEqual(next(segments), ("content", "first", None))
+
+        image = SimpleNamespace(filename="pic.png", content_type="image/png")
+        message = SimpleNamespace(
+            content="",
+            embeds=[],
+            attachments=[image],
+            message_snapshots=[SimpleNamespace(message=SimpleNamespace(content="fwd", embeds=[], attachments=[]))],
+            reference=None,
+        )
+
+        self.assertEqual(
+            list(DoxxingDetector.message_segments(message, include_images=True)),
+            [
+                ("content", "", None),
+                ("attachment", "pic.png", None),
+                ("ocr", "", image),
+                ("snapshot", "fwd", None),
+            ],
+        )
+        self.assertEqual(
+            DoxxingDetector.message_search_parts(message),
+            [("attachment", "pic.png"), ("snapshot", "fwd")],
+        )
+
+    def test_message_view_reads_snapshots_once_and_stands_in_for_the_message(self):
+        snapshot_reads = []
+
+        class ForwardMessage:
+            id = 123
+            content = ""
+            embeds = []
+            attachments = []
+            reference = SimpleNamespace(type=1, channel_id=456, message_id=789)
+            jump_url = "https://discord.com/channels/1/456/123"
+
+            @property
+            def message_snapshots(self):
+                snapshot_reads.append(True)
+                return [SimpleNamespace(message=SimpleNamespace(content="fwd", embeds=[], attachments=[]))]
+
+        view = MessageView(ForwardMessage())
+
+        self.assertTrue(DoxxingDetector.is_forward_message(view))
+        self.assertTrue(DoxxingDetector.needs_reference_fetch_for_scan(view))
+        self.assertFalse(DoxxingDetector.may_need_current_message_refetch(view))
+        self.assertTrue(DoxxingDetector.is_reference_like_message(view))
+        self.assertEqual(DoxxingDetector.message_search_parts(view), [("snapshot", "fwd")])
+        self.assertEqual(len(snapshot_reads), 1)
+        self.assertIs(MessageView.of(view), view)
+        self.assertEqual(view.jump_url, "https://discord.com/channels/1/456/123")
+        with self.assertRaises(AttributeError):
+            view.missing_field
+
+        dict_view = MessageView({"id": 5, "content": "hi", "author": "someone"})
+        self.assertEqual(dict_view.author, "someone")
+        self.assertEqual(DoxxingDetector.field_value(dict_view, "missing", "default"), "default")
+
+    def test_preprocess_ocr_image_returns_undecodable_bytes_unchanged(self):
+        self.assertEqual(DoxxingDetector.preprocess_ocr_image(b"not an image"), (b"not an image", 0, 0))
+
+    def test_ocr_preprocess_stats_estimate_time_saved(self):
+        detector = DoxxingDetector(SimpleNamespace())
+        detector.record_ocr_timings(
+            {"pixels_before": 8_000_000, "pixels_after": 2_000_000, "preprocess_seconds": 0.1, "ocr_seconds": 1.0}
+        )
+        detector.record_ocr_timings(
+            {"pixels_before": 0, "pixels_after": 0, "preprocess_seconds": 0.0, "ocr_seconds": 1.0}
+        )
+
+        report = detector.ocr_stats_report()
+
+        self.assertIn("OCR preprocessing: 1/2 images shrunk or cropped, 4.00 -> 1.00 MP avg", report)
+        self.assertIn("~2950 ms saved per image", report)
+
+    def test_message_location_index_keeps_recent_ids_per_guild(self):
+        index = MessageLocationIndex(max_messages_per_guild=2)
+        index.add(1, 100, 10)
+        index.add(1, 101, 11)
+        index.add(2, 200, 20)
+        index.add(1, 102, 12)
+        index.add(1, 102, 13)
+
+        self.assertIsNone(index.channel_id(1, 100))
+        self.assertEqual(index.channel_id(1, 101), 11)
+        self.assertEqual(index.channel_id(1, 102), 13)
+        self.assertEqual(index.channel_id(2, 200), 20)
+        self.assertEqual(len(index), 3)
+
+        index.remove(1, 101)
+        index.add(1, 103, 14)
+
+        self.assertIsNone(index.channel_id(1, 101))
+        self.assertEqual(len(index), 3)
+
+    def test_message_location_index_keeps_an_id_added_again_after_removal(self):
+        index = MessageLocationIndex(max_messages_per_guild=2)
+        index.add(1, 100, 10)
+        index.remove(1, 100)
+        index.add(1, 100, 10)
+        index.add(1, 101, 11)
+
+        self.assertEqual(index.channel_id(1, 100), 10)
+        self.assertEqual(index.channel_id(1, 101), 11)
+
+        index.add(1, 102, 12)
+
+        self.assertIsNone(index.channel_id(1, 100))
+        self.assertEqual(len(index), 2)
+
+    def test_bounded_cache_evicts_least_recently_used_entry(self):
+        cache = BoundedCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_bounded_cache_expires_entries_after_ttl(self):
+        now = [100.0]
+        cache = BoundedCache(10, ttl_seconds=5, clock=lambda: now[0])
+        cache.set("a", "text")
+
+        self.assertEqual(cache.get("a"), "text")
+        now[0] += 5
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses, cache.expirations), (1, 1, 1))
+
+    def test_latency_histogram_percentiles_stay_within_one_bucket(self):
+        histogram = LatencyHistogram()
+        for milliseconds in range(1, 101):
+            histogram.record(milliseconds / 1000)
+
+        bucket_width = 2 ** (1 / 4)
+        self.assertLessEqual(0.050, histogram.percentile(50))
+        self.assertLess(histogram.percentile(50), 0.050 * bucket_width)
+        self.assertLessEqual(0.099, histogram.percentile(99))
+        self.assertLessEqual(histogram.percentile(99), 0.100)
+        self.assertEqual(histogram.max_seconds, 0.1)
+
+        histogram.record(10_000)
+        histogram.record(0)
+        self.assertEqual(len(histogram.counts), 96)
+        self.assertEqual(histogram.percentile(100), 10_000)
+        self.assertEqual(LatencyHistogram().stats_text(), "no samples")
+
+    def test_bounded_cache_per_entry_ttl_overrides_default(self):
+        now = [100.0]
+        cache = BoundedCache(10, ttl_seconds=60, clock=lambda: now[0])
+        cache.set("short", "text", ttl_seconds=5)
+        cache.set("long", "text")
+        now[0] += 5
+
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("long"), "text")
+
+    def test_bounded_cache_limits_total_value_size(self):
+        cache = BoundedCache(10, max_bytes=10, sizeof=len)
+        cache.set("a", "12345")
+        cache.set("b", "123456")
+        cache.set("huge", "x" * 11)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "123456")
+        self.assertIsNone(cache.get("huge"))
+        self.assertEqual(cache.total_bytes, 6)
+
+    def test_bounded_cache_discards_entries(self):
+        cache = BoundedCache(10, max_bytes=10, sizeof=len)
+        cache.set("a", "12345")
+
+        self.assertTrue(cache.discard("a"))
+        self.assertFalse(cache.discard("a"))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_bounded_cache_keeps_empty_string_values(self):
+        cache = BoundedCache(10)
+        cache.set("a", "")
+
+        self.assertEqual(cache.get("a"), "")
+        self.assertEqual(cache.hit_ratio(), 1.0)
+
+    def test_cache_stats_report_lists_detector_caches(self):
+        detector = DoxxingDetector(SimpleNamespace())
+        detector._attachment_ocr_cache.set(("id", 1), "text")
+        detector._attachment_ocr_cache.get(("id", 1))
+        detector._attachment_ocr_cache.get(("id", 2))
+
+        report = detector.cache_stats_report()
+
+        self.assertIn("Reference fetch cache: 0/", report)
+        self.assertIn("Message refetch cache: 0/", report)
+        self.assertIn("Attachment OCR cache: 1/", report)
+        self.assertIn("hit ratio 50.0%", report)
+
     def test_ocr_dependency_report_includes_package_status(self):
         detector = DoxxingDetector(SimpleNamespace())
 
@@ -449,7 +1001,335 @@ class DoxxingDetectorAsyncTest(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(calls[0], ("load",))
         self.assertEqual(calls[1][0], "ocr")
 
-    async def test_ocr_attachment_timeout_is_logged_without_raising(self):
+    async def test_single_flight_shares_one_call_between_concurrent_callers(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(True)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.run("key", fetch) for _ in range(3)))
+        later = await flights.run("key", fetch)
+
+        self.assertEqual(results, ["result"] * 3)
+        self.assertEqual(later, "result")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(flights.stats_text(), "2 started, 2 joined an in-flight call, 0 in flight")
+
+    async def test_single_flight_cancels_call_only_when_every_caller_cancels(self):
+        flights = SingleFlight()
+        cancelled = []
+
+        async def slow_fetch():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return "result"
+
+        first = asyncio.ensure_future(flights.run("key", slow_fetch))
+        second = asyncio.ensure_future(flights.run("key", slow_fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(cancelled, [])
+        self.assertFalse(second.done())
+
+        second.cancel()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(len(flights), 0)
+
+    async def test_concurrent_ocr_of_same_attachment_reads_and_runs_once(self):
+        reads = []
+
+        class FakeDetector(DoxxingDetector):
+            async def ocr_image_bytes(self, image_bytes):
+                await asyncio.sleep(0.01)
+                return "shared text"
+
+        async def read_attachment():
+            reads.append(True)
+            return b"image"
+
+        detector = FakeDetector(SimpleNamespace())
+        attachments = [
+            SimpleNamespace(id=55, filename="meme.png", content_type="image/png", read=read_attachment)
+            for _ in range(5)
+        ]
+
+        texts = await asyncio.gather(*(detector.ocr_attachment_text(attachment) for attachment in attachments))
+
+        self.assertEqual(texts, ["shared text"] * 5)
+        self.assertEqual(len(reads), 1)
+        self.assertIn("OCR runs: 1", detector.ocr_stats_report())
+
+    async def test_concurrent_reference_fetches_share_one_request(self):
+        fetched = []
+
+        class FakeChannel:
+            id = 456
+
+            async def fetch_message(self, message_id):
+                fetched.append(message_id)
+                await asyncio.sleep(0.01)
+                return SimpleNamespace(
+                    content="email me at person@example.com",
+                    embeds=[],
+                    attachments=[],
+                    message_snapshots=[],
+                    reference=None,
+                )
+
+        channel = FakeChannel()
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: channel))
+
+        def forward():
+            return SimpleNamespace(
+                guild=None,
+                reference=SimpleNamespace(type=None, channel_id=456, message_id=789),
+            )
+
+        results = await asyncio.gather(*(detector.fetch_referenced_message_content(forward()) for _ in range(4)))
+
+        self.assertEqual(fetched, [789])
+        self.assertTrue(all("person@example.com" in content for content, _error in results))
+        self.assertIn("3 joined an in-flight call", detector.cache_stats_report())
+
+    async def test_reference_cache_is_shared_across_forwards_and_invalidated_by_edits(self):
+        fetched = []
+
+        class FakeChannel:
+            id = 456
+
+            async def fetch_message(self, message_id):
+                fetched.append(message_id)
+                return SimpleNamespace(
+                    content=f"version {len(fetched)}",
+                    embeds=[],
+                    attachments=[],
+                    message_snapshots=[],
+                    reference=None,
+                )
+
+        channel = FakeChannel()
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: channel))
+
+        def forward():
+            return SimpleNamespace(
+                guild=SimpleNamespace(id=7),
+                reference=SimpleNamespace(type=None, channel_id=456, message_id=789),
+            )
+
+        first = await detector.fetch_referenced_message_content(forward())
+        second = await detector.fetch_referenced_message_content(forward())
+        await detector.on_raw_message_edit(SimpleNamespace(guild_id=7, channel_id=456, message_id=789))
+        after_edit = await detector.fetch_referenced_message_content(forward())
+        await detector.on_raw_message_delete(SimpleNamespace(guild_id=7, channel_id=456, message_id=789))
+        after_delete = await detector.fetch_referenced_message_content(forward())
+
+        self.assertEqual(first, ("version 1", None))
+        self.assertEqual(second, ("version 1", None))
+        self.assertEqual(after_edit, ("version 2", None))
+        self.assertEqual(after_delete, ("version 3", None))
+        self.assertEqual(fetched, [789, 789, 789])
+
+    async def test_messages_with_unscanned_images_are_not_cached(self):
+        fetched = []
+        ocr_outcomes = [OcrQueueFull("full"), OcrFailed("tesseract crashed"), "call 555-123-4567"] * 2
+        image = SimpleNamespace(filename="contact.png", content_type="image/png")
+
+        class FakeDetector(DoxxingDetector):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
+                outcome = ocr_outcomes.pop(0)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+
+        class FakeChannel:
+            id = 456
+
+            async def fetch_message(self, message_id):
+                fetched.append(message_id)
+                return SimpleNamespace(content="", embeds=[], attachments=[image], message_snapshots=[], reference=None)
+
+        channel = FakeChannel()
+        detector = FakeDetector(SimpleNamespace(get_channel=lambda channel_id: channel))
+        forward = SimpleNamespace(
+            guild=SimpleNamespace(id=7),
+            reference=SimpleNamespace(type=None, channel_id=456, message_id=789),
+        )
+        refetched = SimpleNamespace(id=790, channel=channel)
+
+        references = [await detector.fetch_referenced_message_content(forward) for _ in range(4)]
+        refetches = [await detector.fetch_current_message_content(refetched) for _ in range(4)]
+
+        for results in (references, refetches):
+            self.assertNotIn("555", results[0][0])
+            self.assertNotIn("555", results[1][0])
+            self.assertIn("555-123-4567", results[2][0])
+            self.assertEqual(results[3], results[2])
+        self.assertEqual(fetched, [789, 789, 789, 790, 790, 790])
+
+    async def test_edited_message_is_rescanned_only_when_its_content_changes(self):
+        deleted = []
+        read_images = []
+
+        async def discard(*args, **kwargs):
+            pass
+
+        async def delete_message():
+            deleted.append(True)
+
+        async def read_attachment():
+            read_images.append(True)
+            return b"image"
+
+        class FakeDetector(DoxxingDetector):
+            async def ocr_image_bytes(self, image_bytes):
+                return "holiday photo"
+
+        log_channel = SimpleNamespace(send=discard)
+        guild = SimpleNamespace(id=7, get_channel=lambda channel_id: log_channel, get_member=lambda member_id: None, me=None)
+        detector = FakeDetector(SimpleNamespace(get_channel=lambda channel_id: log_channel, user=SimpleNamespace(id=999)))
+        image = SimpleNamespace(id=55, filename="photo.png", content_type="image/png", size=100, read=read_attachment)
+
+        def message_version(content):
+            return SimpleNamespace(
+                id=789,
+                guild=guild,
+                author=SimpleNamespace(bot=False, mention="@user", id=321, send=discard, roles=[]),
+                channel=SimpleNamespace(id=456, mention="#general"),
+                content=content,
+                embeds=[],
+                attachments=[image],
+                message_snapshots=[],
+                reference=None,
+                delete=delete_message,
+            )
+
+        def edit(content):
+            return SimpleNamespace(guild_id=7, channel_id=456, message_id=789, message=message_version(content))
+
+        with mock.patch.object(discord, "Member", SimpleNamespace):
+            await detector.on_message(message_version("look at this"))
+            await detector.on_raw_message_edit(edit("look at this"))
+            await detector.on_raw_message_edit(edit("call me 555-123-4567"))
+            await detector.on_raw_message_edit(edit("call me 555-123-4567!"))
+        await detector.on_raw_message_edit(SimpleNamespace(guild_id=7, channel_id=456, message_id=790))
+
+        self.assertEqual(deleted, [True])
+        self.assertEqual(read_images, [True])
+        counts = detector._edit_scan_counts
+        self.assertEqual(
+            (counts["edits"], counts["unchanged"], counts["rescanned"], counts["already matched"], counts["no message"]),
+            (4, 1, 1, 1, 1),
+        )
+
+        await detector.on_raw_message_delete(SimpleNamespace(guild_id=7, channel_id=456, message_id=789))
+        self.assertIsNone(detector._edit_scan_records.get(789))
+
+    async def test_edit_during_the_first_scan_waits_for_it(self):
+        deleted = []
+        dms = []
+        ocr_started = asyncio.Event()
+        release_ocr = asyncio.Event()
+
+        async def discard(*args, **kwargs):
+            pass
+
+        async def delete_message():
+            deleted.append(True)
+
+        async def send_dm(*args, **kwargs):
+            dms.append(True)
+
+        async def read_attachment():
+            return b"image"
+
+        class FakeDetector(DoxxingDetector):
+            async def ocr_image_bytes(self, image_bytes):
+                ocr_started.set()
+                await release_ocr.wait()
+                return "call me 555-123-4567"
+
+        log_channel = SimpleNamespace(send=discard)
+        guild = SimpleNamespace(id=7, get_channel=lambda channel_id: log_channel, get_member=lambda member_id: None, me=None)
+        detector = FakeDetector(SimpleNamespace(get_channel=lambda channel_id: log_channel, user=SimpleNamespace(id=999)))
+        image = SimpleNamespace(id=55, filename="photo.png", content_type="image/png", size=100, read=read_attachment)
+
+        def message_version(content):
+            return SimpleNamespace(
+                id=789,
+                guild=guild,
+                author=SimpleNamespace(bot=False, mention="@user", id=321, send=send_dm, roles=[]),
+                channel=SimpleNamespace(id=456, mention="#general"),
+                content=content,
+                embeds=[],
+                attachments=[image],
+                message_snapshots=[],
+                reference=None,
+                delete=delete_message,
+            )
+
+        edit = SimpleNamespace(
+            guild_id=7, channel_id=456, message_id=789, message=message_version("look at this!")
+        )
+        with mock.patch.object(discord, "Member", SimpleNamespace):
+            first_scan = asyncio.ensure_future(detector.on_message(message_version("look at this")))
+            await ocr_started.wait()
+            edit_scan = asyncio.ensure_future(detector.on_raw_message_edit(edit))
+            await asyncio.sleep(0)
+            release_ocr.set()
+            await asyncio.gather(first_scan, edit_scan)
+
+        self.assertEqual(deleted, [True])
+        self.assertEqual(dms, [True])
+        self.assertEqual(detector._edit_scan_counts["already matched"], 1)
+        self.assertEqual(detector._edit_scan_counts["rescanned"], 0)
+        self.assertEqual(len(detector._message_scans), 0)
+
+    async def test_ocr_executor_timeout_excludes_queue_wait(self):
+        executor = OcrExecutor("thread", max_workers=1)
+        self.addCleanup(executor.shutdown)
+
+        results = await asyncio.gather(
+            executor.run(lambda: time.sleep(0.2) or "first", timeout=0.3),
+            executor.run(lambda: time.sleep(0.2) or "second", timeout=0.3),
+        )
+
+        self.assertEqual(results, ["first", "second"])
+        self.assertEqual(executor.jobs, 2)
+        self.assertGreaterEqual(executor.queue_wait_seconds, 0.15)
+        self.assertIn("thread x 1 workers, 2 jobs, 0 waiting", executor.stats_text())
+
+    async def test_ocr_executor_holds_slot_until_timed_out_job_finishes(self):
+        executor = OcrExecutor("thread", max_workers=1)
+        self.addCleanup(executor.shutdown)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await executor.run(time.sleep, 0.2, timeout=0.01)
+        started_at = time.monotonic()
+        await executor.run(lambda: None)
+
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.1)
+
+    async def test_ocr_executor_runs_jobs_in_process_pool(self):
+        executor = OcrExecutor("process", max_workers=1)
+        self.addCleanup(executor.shutdown)
+
+        self.assertEqual(await executor.run(len, b"fake image"), 10)
+
+    def test_ocr_executor_rejects_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            OcrExecutor("gpu")
+
+    async def test_ocr_attachment_timeout_is_logged_and_raised_as_ocr_failure(self):
         sent_embeds = []
 
         async def send_log(embed):
@@ -472,12 +1352,80 @@ class DoxxingDetectorAsyncTest(unittest.IsolatedAsyncioTestCase):
             read=read_attachment,
         )
 
-        text = await detector.ocr_attachment_text(attachment, guild)
+        with self.assertRaises(OcrFailed):
+            await detector.ocr_attachment_text(attachment, guild)
 
-        self.assertEqual(text, "")
         self.assertEqual(len(sent_embeds), 1)
         self.assertIn("exceeded", sent_embeds[0].description)
 
+    async def test_ocr_attachment_reuses_text_for_identical_image_bytes(self):
+        class FakeDetector(DoxxingDetector):
+            async def ocr_image_bytes(self, image_bytes):
+                self.ocr_inputs.append(image_bytes)
+                return "call  555-123-4567"
+
+        def image_attachment(attachment_id, image_bytes):
+            async def read_attachment():
+                return image_bytes
+
+            return SimpleNamespace(
+                id=attachment_id,
+                filename="meme.png",
+                content_type="image/png",
+                size=len(image_bytes),
+                read=read_attachment,
+            )
+
+        detector = FakeDetector(SimpleNamespace())
+        detector.ocr_inputs = []
+
+        texts = [
+            await detector.ocr_attachment_text(image_attachment(1, b"same image")),
+            await detector.ocr_attachment_text(image_attachment(2, b"same image")),
+            await detector.ocr_attachment_text(image_attachment(2, b"same image")),
+            await detector.ocr_attachment_text(image_attachment(3, b"other image")),
+        ]
+
+        self.assertEqual(texts[:3], ["call 555-123-4567"] * 3)
+        self.assertEqual(detector.ocr_inputs, [b"same image", b"other image"])
+        report = detector.ocr_stats_report()
+        self.assertIn("OCR runs: 2", report)
+        self.assertIn("OCR runs skipped: 2", report)
+        self.assertIn("Skipped by attachment id/url: 1", report)
+        self.assertIn("Skipped by image bytes: 1", report)
+
+    async def test_ocr_attachment_reuses_text_for_matching_perceptual_hash(self):
+        class FakeDetector(DoxxingDetector):
+            async def ocr_image_bytes(self, image_bytes):
+                self.ocr_inputs.append(image_bytes)
+                return "meme text"
+
+            @staticmethod
+            def perceptual_image_hash(image_bytes):
+                return (1.0, 42)
+
+        def image_attachment(attachment_id, image_bytes):
+            async def read_attachment():
+                return image_bytes
+
+            return SimpleNamespace(
+                id=attachment_id,
+                filename="meme.jpg",
+                content_type="image/jpeg",
+                read=read_attachment,
+            )
+
+        detector = FakeDetector(SimpleNamespace())
+        detector.ocr_inputs = []
+
+        with mock.patch.object(doxxing_detector_module, "OCR_PERCEPTUAL_HASH_ENABLED", True):
+            first = await detector.ocr_attachment_text(image_attachment(1, b"original"))
+            second = await detector.ocr_attachment_text(image_attachment(2, b"recompressed"))
+
+        self.assertEqual((first, second), ("meme text", "meme text"))
+        self.assertEqual(detector.ocr_inputs, [b"original"])
+        self.assertIn("Skipped by perceptual hash: 1", detector.ocr_stats_report())
+
     async def test_ocr_status_command_reports_dependency_status(self):
         sent_messages = []
 
@@ -492,6 +1440,160 @@ class DoxxingDetectorAsyncTest(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(sent_messages), 1)
         self.assertIn("Python:", sent_messages[0])
 
+    async def test_dox_stats_command_reports_scan_counts(self):
+        sent_messages = []
+
+        async def send_message(content):
+            sent_messages.append(content)
+
+        detector = DoxxingDetector(SimpleNamespace())
+        detector.scan_doxxing_types("hello")
+        ctx = SimpleNamespace(send=send_message)
+
+        await DoxxingDetector.dox_stats.callback(detector, ctx)
+
+        self.assertEqual(len(sent_messages), 1)
+        self.assertIn("Messages scanned: 1", sent_messages[0])
+        self.assertIn("Attachment OCR cache:", sent_messages[0])
+        self.assertIn("Messages scanned per minute:", sent_messages[0])
+        self.assertIn("Reference fetch: no samples", sent_messages[0])
+
+    async def test_ocr_job_queue_runs_urgent_and_small_jobs_first(self):
+        queue = OcrJobQueue(max_jobs=10, concurrency=1)
+        order = []
+        release = asyncio.Event()
+
+        async def job(name):
+            if name == "blocker":
+                await release.wait()
+            order.append(name)
+
+        blocker = asyncio.ensure_future(queue.run(1, 0, lambda: job("blocker")))
+        await asyncio.sleep(0)
+        jobs = [
+            asyncio.ensure_future(queue.run(priority, size, lambda name=name: job(name)))
+            for name, priority, size in [
+                ("large", 1, 5_000_000),
+                ("small", 1, 10_000),
+                ("urgent large", 0, 5_000_000),
+                ("urgent small", 0, 10_000),
+            ]
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(blocker, *jobs)
+
+        self.assertEqual(order, ["blocker", "urgent small", "urgent large", "small", "large"])
+        self.assertEqual(queue.wait_latency.count, 5)
+
+    async def test_ocr_job_queue_sheds_when_full_and_frees_cancelled_slots(self):
+        queue = OcrJobQueue(max_jobs=1, concurrency=1)
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+            return "done"
+
+        running = asyncio.ensure_future(queue.run(1, 0, blocker))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(queue.run(1, 0, blocker))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(OcrQueueFull):
+            await queue.run(1, 0, blocker)
+
+        waiting.cancel()
+        await asyncio.sleep(0)
+        replacement = asyncio.ensure_future(queue.run(1, 0, blocker))
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await asyncio.gather(running, replacement), ["done", "done"])
+        self.assertEqual(queue.stats_text(), "0/1 waiting, 0/1 running, 2 started, 1 shed")
+
+    async def test_shed_images_are_skipped_and_logged_once_per_interval(self):
+        sent_embeds = []
+
+        async def send_log(embed):
+            sent_embeds.append(embed)
+
+        async def read_attachment():
+            return b"image"
+
+        log_channel = SimpleNamespace(send=send_log)
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: log_channel))
+        detector._ocr_queue.max_jobs = 0
+        message = SimpleNamespace(
+            content="look",
+            embeds=[],
+            attachments=[
+                SimpleNamespace(id=index, filename=f"{index}.png", content_type="image/png", size=100, read=read_attachment)
+                for index in range(3)
+            ],
+            message_snapshots=[],
+            reference=None,
+            guild=None,
+        )
+
+        scan_result = await detector.build_scan_result(message)
+
+        self.assertEqual(scan_result.shed_images, 3)
+        self.assertEqual(len(sent_embeds), 1)
+        self.assertIn("OCR queue is full", sent_embeds[0].description)
+        self.assertIn("OCR queue: 0/0 waiting, 0/", detector.ocr_stats_report())
+        self.assertIn("3 shed", detector.ocr_stats_report())
+
+    async def test_on_message_deletes_clean_message_with_shed_images_for_review(self):
+        deleted = []
+        sent_embeds = []
+
+        async def delete_message():
+            deleted.append(True)
+
+        async def send_log(embed):
+            sent_embeds.append(embed)
+
+        async def read_attachment():
+            return b"image"
+
+        log_channel = SimpleNamespace(send=send_log)
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: log_channel))
+        detector._ocr_queue.max_jobs = 0
+        message = SimpleNamespace(
+            guild=SimpleNamespace(get_channel=lambda channel_id: log_channel),
+            author=SimpleNamespace(bot=True, mention="@bot", id=5, roles=[]),
+            channel=SimpleNamespace(id=456, mention="#general"),
+            content="",
+            embeds=[],
+            attachments=[SimpleNamespace(id=1, filename="1.png", content_type="image/png", size=100, read=read_attachment)],
+            message_snapshots=[SimpleNamespace(message=SimpleNamespace(content="fwd", embeds=[], attachments=[]))],
+            reference=None,
+            delete=delete_message,
+        )
+
+        with mock.patch.object(doxxing_detector_module, "OCR_QUEUE_SHED_POLICY", "delete and review"):
+            await detector.on_message(message)
+
+        self.assertEqual(deleted, [True])
+        self.assertEqual(sent_embeds[-1].title, "Message removed for review")
+
+    def test_ocr_priority_favors_always_delete_forwards_and_new_accounts(self):
+        detector = DoxxingDetector(SimpleNamespace())
+        reference = SimpleNamespace(type=1, channel_id=1, message_id=2)
+        old = discord.utils.utcnow() - datetime.timedelta(days=365)
+
+        def message(roles=(), created_at=old, with_reference=True):
+            return SimpleNamespace(
+                author=SimpleNamespace(roles=list(roles), created_at=created_at),
+                reference=reference if with_reference else None,
+            )
+
+        always_delete_role = SimpleNamespace(id=next(iter(ALWAYS_DELETE_FORWARD_ROLE_IDS)))
+        self.assertEqual(detector.ocr_priority(message(roles=[always_delete_role])), 0)
+        self.assertEqual(detector.ocr_priority(message(created_at=discord.utils.utcnow())), 0)
+        self.assertEqual(detector.ocr_priority(message()), 1)
+        self.assertEqual(detector.ocr_priority(message(roles=[always_delete_role], with_reference=False)), 1)
+
     async def test_ocr_image_command_returns_attachment_text(self):
         sent_messages = []
 
@@ -499,7 +1601,7 @@ class DoxxingDetectorAsyncTest(unittest.IsolatedAsyncioTestCase):
             sent_messages.append(content)
 
         class FakeDetector(DoxxingDetector):
-            async def ocr_attachment_text(self, attachment, guild=None):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
                 return "hello from image"
 
         detector = FakeDetector(SimpleNamespace())
@@ -585,7 +1687,7 @@ class DoxxingDetectorAsyncTest(unittest.IsolatedAsyncioTestCase):
 
     async def test_async_search_content_includes_image_ocr_text(self):
         class FakeDetector(DoxxingDetector):
-            async def ocr_attachment_text(self, attachment, guild=None):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
                 if self.is_image_attachment(attachment):
                     return "my number is 555-123-4567"
                 return ""
@@ -613,9 +1715,180 @@ class DoxxingDetectorAsyncTest(unittest.IsolatedAsyncioTestCase):
 
         self.assertIn("phone number", DoxxingDetector.find_doxxing_types(searchable))
 
+    async def test_async_search_content_runs_ocr_concurrently_in_order(self):
+        class FakeDetector(DoxxingDetector):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+                await asyncio.sleep(attachment.delay)
+                self.running -= 1
+                return f"ocr {attachment.filename}"
+
+        def image(name, delay):
+            return SimpleNamespace(filename=name, content_type="image/png", delay=delay)
+
+        detector = FakeDetector(SimpleNamespace())
+        detector.running = 0
+        detector.max_running = 0
+        message = SimpleNamespace(
+            content="message text",
+            embeds=[],
+            attachments=[image(f"{index}.png", 0.05 - index * 0.01) for index in range(4)],
+            message_snapshots=[
+                SimpleNamespace(
+                    message=SimpleNamespace(
+                        content="snapshot text",
+                        embeds=[],
+                        attachments=[image("4.png", 0.01), image("5.png", 0.02)],
+                    )
+                )
+            ],
+            reference=None,
+            guild=None,
+        )
+
+        searchable = await detector.async_message_search_content(message)
+
+        ocr_lines = [line for line in searchable.splitlines() if line.startswith("ocr ")]
+        self.assertEqual(ocr_lines, [f"ocr {index}.png" for index in range(6)])
+        self.assertLess(searchable.index("ocr 3.png"), searchable.index("snapshot text"))
+        self.assertEqual(detector.max_running, MAX_CONCURRENT_MESSAGE_OCR)
+
+    async def test_staged_scan_skips_ocr_when_plain_text_has_pii(self):
+        class FakeDetector(DoxxingDetector):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
+                self.ocr_attempts.append(attachment)
+                return ""
+
+        detector = FakeDetector(SimpleNamespace())
+        detector.ocr_attempts = []
+        message = SimpleNamespace(
+            content="call me at 555-123-4567",
+            embeds=[],
+            attachments=[SimpleNamespace(filename="meme.png", content_type="image/png")],
+            message_snapshots=[],
+            reference=None,
+            guild=None,
+        )
+
+        searchable = await detector.message_search_content_with_forward_fetch(message, stop_on_match=True)
+
+        self.assertEqual(detector.ocr_attempts, [])
+        self.assertIn("phone number", DoxxingDetector.find_doxxing_types(searchable))
+        self.assertIn("OCR avoided by plain-text verdicts: 1", detector.ocr_stats_report())
+
+    async def test_staged_scan_stops_walking_text_at_first_matching_part(self):
+        class LateSnapshotsMessage:
+            content = "call me at 555-123-4567"
+            embeds = []
+            attachments = []
+            reference = None
+            guild = None
+
+            @property
+            def message_snapshots(self):
+                raise AssertionError("snapshots walked after a match")
+
+        detector = DoxxingDetector(SimpleNamespace())
+
+        scan_result = await detector.build_scan_result(LateSnapshotsMessage(), stop_on_match=True)
+
+        self.assertEqual(scan_result.parts, [("content", "call me at 555-123-4567")])
+
+    async def test_staged_scan_cancels_outstanding_ocr_after_a_match(self):
+        class FakeDetector(DoxxingDetector):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
+                try:
+                    await asyncio.sleep(attachment.delay)
+                except asyncio.CancelledError:
+                    self.cancelled.append(attachment.filename)
+                    raise
+                return attachment.text
+
+        detector = FakeDetector(SimpleNamespace())
+        detector.cancelled = []
+        message = SimpleNamespace(
+            content="look at these",
+            embeds=[],
+            attachments=[
+                SimpleNamespace(filename="slow.png", content_type="image/png", delay=5, text="nothing"),
+                SimpleNamespace(filename="dox.png", content_type="image/png", delay=0, text="555-123-4567"),
+            ],
+            message_snapshots=[],
+            reference=None,
+            guild=None,
+        )
+
+        searchable = await asyncio.wait_for(
+            detector.message_search_content_with_forward_fetch(message, stop_on_match=True),
+            timeout=1,
+        )
+        await asyncio.sleep(0)
+
+        self.assertIn("555-123-4567", searchable)
+        self.assertNotIn("nothing", searchable)
+        self.assertEqual(detector.cancelled, ["slow.png"])
+        self.assertIn("OCR cancelled after a match: 1", detector.ocr_stats_report())
+
+    async def test_staged_scan_keeps_plain_text_when_fetch_matches_first(self):
+        class FakeDetector(DoxxingDetector):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    self.cancelled.append(attachment.filename)
+                    raise
+                return "late ocr"
+
+            async def forward_fetch_parts(self, message):
+                return [("fetched reference", "call me at 555-123-4567")]
+
+        detector = FakeDetector(SimpleNamespace())
+        detector.cancelled = []
+        message = SimpleNamespace(
+            content="look at this",
+            embeds=[SimpleNamespace(title="embed title", description="", fields=[])],
+            attachments=[SimpleNamespace(filename="slow.png", content_type="image/png")],
+            message_snapshots=[],
+            reference=None,
+            guild=None,
+        )
+
+        scan_result = await asyncio.wait_for(detector.build_scan_result(message, stop_on_match=True), timeout=1)
+        await asyncio.sleep(0)
+
+        self.assertEqual(scan_result.sources, ["content", "embed", "attachment", "fetched reference"])
+        self.assertIn("look at this", scan_result.content)
+        self.assertIn("555-123-4567", scan_result.content)
+        self.assertNotIn("late ocr", scan_result.content)
+        self.assertEqual(detector.cancelled, ["slow.png"])
+
+    async def test_full_scan_waits_for_every_ocr_result(self):
+        class FakeDetector(DoxxingDetector):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
+                await asyncio.sleep(attachment.delay)
+                return attachment.text
+
+        detector = FakeDetector(SimpleNamespace())
+        message = SimpleNamespace(
+            content="",
+            embeds=[],
+            attachments=[
+                SimpleNamespace(filename="a.png", content_type="image/png", delay=0.02, text="first"),
+                SimpleNamespace(filename="b.png", content_type="image/png", delay=0, text="555-123-4567"),
+            ],
+            message_snapshots=[],
+            reference=None,
+            guild=None,
+        )
+
+        searchable = await detector.message_search_content_with_forward_fetch(message)
+
+        self.assertLess(searchable.index("first"), searchable.index("555-123-4567"))
+
     async def test_async_search_content_does_not_ocr_non_image_attachments(self):
         class FakeDetector(DoxxingDetector):
-            async def ocr_attachment_text(self, attachment, guild=None):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
                 self.ocr_attempts.append(attachment)
                 return "person@example.com"
 
@@ -758,6 +2031,201 @@ class DoxxingDetectorAsyncTest(unittest.IsolatedAsyncioTestCase):
         self.assertIn("phone number", DoxxingDetector.find_doxxing_types(searchable))
         self.assertIsNone(error)
 
+    async def test_reference_without_channel_uses_message_location_index(self):
+        fetched_channel_ids = []
+
+        class FakeChannel:
+            def __init__(self, channel_id):
+                self.id = channel_id
+
+            async def fetch_message(self, message_id):
+                fetched_channel_ids.append(self.id)
+                if self.id != 42:
+                    raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+                return SimpleNamespace(
+                    content="email me at person@example.com",
+                    embeds=[],
+                    attachments=[],
+                    message_snapshots=[],
+                    reference=None,
+                )
+
+        channels = {channel_id: FakeChannel(channel_id) for channel_id in range(1, 50)}
+        guild = SimpleNamespace(
+            id=7,
+            get_channel=channels.get,
+            text_channels=list(channels.values()),
+            threads=[],
+            channels=[],
+        )
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: None))
+        await detector.on_raw_message_edit(SimpleNamespace(guild_id=7, message_id=789, channel_id=42))
+        message = SimpleNamespace(
+            content="",
+            embeds=[],
+            attachments=[],
+            message_snapshots=[],
+            channel=SimpleNamespace(id=456),
+            guild=guild,
+            reference=SimpleNamespace(
+                type=None,
+                channel_id=None,
+                message_id=789,
+                resolved=None,
+                cached_message=None,
+            ),
+        )
+
+        content, error = await detector.fetch_referenced_message_content(message)
+
+        self.assertIsNone(error)
+        self.assertIn("person@example.com", content)
+        self.assertEqual(fetched_channel_ids, [42])
+        self.assertIn("hit ratio 100.0%", detector._message_locations.stats_text())
+
+    async def test_forbidden_channel_skips_later_message_fetches_until_expiry(self):
+        fetched = []
+
+        class ForbiddenChannel:
+            id = 456
+
+            async def fetch_message(self, message_id):
+                fetched.append(message_id)
+                raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Missing Access")
+
+        channel = ForbiddenChannel()
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: None))
+        now = [100.0]
+        detector._failed_fetch_cache.clock = lambda: now[0]
+
+        first = await detector.fetch_message_content_from_channel(channel, 456, 789)
+        second = await detector.fetch_message_content_from_channel(channel, 456, 790)
+        now[0] += doxxing_detector_module.FAILED_FETCH_CACHE_TTL_SECONDS
+        await detector.fetch_message_content_from_channel(channel, 456, 791)
+
+        self.assertIn("Missing permission to fetch referenced message `789`", first[1])
+        self.assertIn("Missing permission to fetch referenced message `790`", second[1])
+        self.assertEqual(fetched, [789, 791])
+        self.assertIn("0 channel and 1 message fetches avoided", detector.cache_stats_report())
+
+    async def test_missing_message_is_remembered_per_message_and_cleared_by_edits(self):
+        fetched = []
+
+        class FakeChannel:
+            id = 456
+
+            async def fetch_message(self, message_id):
+                fetched.append(message_id)
+                if len(fetched) < 3:
+                    raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+                return SimpleNamespace(content="found it", embeds=[], attachments=[], message_snapshots=[], reference=None)
+
+        channel = FakeChannel()
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: None))
+
+        await detector.fetch_message_content_from_channel(channel, 456, 789)
+        repeated = await detector.fetch_message_content_from_channel(channel, 456, 789)
+        await detector.fetch_message_content_from_channel(channel, 456, 790)
+        await detector.on_raw_message_edit(SimpleNamespace(guild_id=7, channel_id=456, message_id=789))
+        after_edit = await detector.fetch_message_content_from_channel(channel, 456, 789)
+
+        self.assertEqual(repeated, ("", "Referenced message `789` was not found in channel `456`."))
+        self.assertEqual(fetched, [789, 790, 789])
+        self.assertEqual(after_edit, ("found it", None))
+
+    async def test_http_errors_back_off_briefly(self):
+        fetched = []
+
+        async def fetch_channel(channel_id):
+            fetched.append(channel_id)
+            raise discord.HTTPException(SimpleNamespace(status=500, reason="Server Error"), "try again")
+
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: None, fetch_channel=fetch_channel))
+        now = [100.0]
+        detector._failed_fetch_cache.clock = lambda: now[0]
+
+        first = await detector.fetch_referenced_message_content_uncached(SimpleNamespace(guild=None), 456, 789)
+        second = await detector.fetch_referenced_message_content_uncached(SimpleNamespace(guild=None), 456, 789)
+        now[0] += doxxing_detector_module.FAILED_FETCH_BACKOFF_SECONDS
+        await detector.fetch_referenced_message_content_uncached(SimpleNamespace(guild=None), 456, 789)
+
+        self.assertEqual(first, second)
+        self.assertIn("Failed to fetch referenced channel `456`", first[1])
+        self.assertIn("try again", first[1])
+        self.assertEqual(fetched, [456, 456])
+        self.assertIn("1 channel and 0 message fetches avoided", detector.cache_stats_report())
+
+    def sweep_channel(self, channel_id, delay, found=False, last_message_id=None, events=None):
+        class FakeChannel:
+            id = channel_id
+
+            async def fetch_message(self, message_id):
+                events.append(("start", channel_id))
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    events.append(("cancelled", channel_id))
+                    raise
+                events.append(("end", channel_id))
+                if not found:
+                    raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+                return SimpleNamespace(content="found it", embeds=[], attachments=[], message_snapshots=[], reference=None)
+
+        channel = FakeChannel()
+        channel.last_message_id = last_message_id
+        return channel
+
+    async def test_guild_sweep_probes_channels_concurrently_and_stops_on_hit(self):
+        events = []
+        channels = [self.sweep_channel(channel_id, 0.2, events=events) for channel_id in range(1, 11)]
+        channels.append(self.sweep_channel(11, 0.01, found=True, last_message_id=500, events=events))
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: None))
+
+        content, errors = await detector.sweep_channels_for_message(
+            detector.sweep_order(channels, 789),
+            789,
+        )
+
+        self.assertEqual(content, "found it")
+        self.assertEqual(errors, [])
+        await asyncio.sleep(0)
+        self.assertEqual(events[0], ("start", 11))
+        in_flight = peak_in_flight = 0
+        for event, _channel_id in events:
+            in_flight += 1 if event == "start" else -1
+            peak_in_flight = max(peak_in_flight, in_flight)
+        self.assertEqual(peak_in_flight, REFERENCE_SWEEP_CONCURRENCY)
+        started = [channel_id for event, channel_id in events if event == "start"]
+        self.assertEqual(len(started), REFERENCE_SWEEP_CONCURRENCY)
+        self.assertEqual([channel_id for event, channel_id in events if event == "end"], [11])
+        cancelled = [channel_id for event, channel_id in events if event == "cancelled"]
+        self.assertEqual(sorted(cancelled), sorted(started[1:]))
+        self.assertIn("1 sweeps, 1 found, 0 out of time, 4.0 channels probed avg", detector.reference_sweep_stats_text())
+
+    def test_sweep_order_puts_active_channels_first_and_newer_channels_last(self):
+        channels = [
+            SimpleNamespace(id=900, last_message_id=2000),
+            SimpleNamespace(id=10, last_message_id=None),
+            SimpleNamespace(id=20, last_message_id=1500),
+            SimpleNamespace(id=30, last_message_id=800),
+        ]
+
+        ordered = DoxxingDetector.sweep_order(channels, 789)
+
+        self.assertEqual([channel.id for channel in ordered], [20, 30, 10, 900])
+
+    async def test_guild_sweep_stops_at_time_budget(self):
+        events = []
+        channels = [self.sweep_channel(channel_id, 5, events=events) for channel_id in range(1, 4)]
+        detector = DoxxingDetector(SimpleNamespace(get_channel=lambda channel_id: None))
+
+        with mock.patch.object(doxxing_detector_module, "REFERENCE_SWEEP_TIME_BUDGET_SECONDS", 0.05):
+            content, errors = await detector.sweep_channels_for_message(channels, 789)
+
+        self.assertIsNone(content)
+        self.assertIn("Guild search stopped after 0.05 seconds", errors[0])
+        self.assertIn("1 out of time", detector.reference_sweep_stats_text())
+
     async def test_reference_with_wrong_channel_id_falls_back_to_guild_search(self):
         class OtherChannel:
             id = 999
@@ -1335,6 +2803,126 @@ class DoxxingDetectorAsyncTest(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(timed_out), 1)
         self.assertEqual(timed_out[0][1], "Posted likely private personal information.")
         self.assertEqual(sent_embeds[-1].title, "Doxxing content removed")
+        latency_report = detector.latency_stats_report()
+        for stage in ("Regex scan", "Delete", "Dm", "Timeout", "Scan total"):
+            self.assertRegex(latency_report, rf"{stage}: p50 .*\(1 samples\)")
+        self.assertIn("Tesseract: no samples", latency_report)
+
+    async def test_detection_actions_delete_first_then_dm_and_timeout_together(self):
+        events = []
+
+        async def delete_message():
+            events.append("delete")
+
+        in_flight = [0, 0]
+
+        async def run_action(name):
+            events.append(f"{name} start")
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            await asyncio.sleep(0)
+            in_flight[0] -= 1
+            events.append(f"{name} end")
+
+        async def send_dm(content):
+            await run_action("dm")
+            raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Cannot send messages to this user")
+
+        async def timeout_member(until, reason=None):
+            await run_action("timeout")
+
+        author = SimpleNamespace(
+            bot=False,
+            send=send_dm,
+            timeout=timeout_member,
+            guild_permissions=SimpleNamespace(administrator=False),
+            roles=[],
+            top_role=1,
+        )
+        me = SimpleNamespace(guild_permissions=SimpleNamespace(moderate_members=True), top_role=2)
+        message = SimpleNamespace(author=author, guild=SimpleNamespace(me=me), delete=delete_message)
+        detector = DoxxingDetector(SimpleNamespace(user=SimpleNamespace(id=1)))
+
+        deleted, timed_out, dm_sent, errors = await detector.apply_detection_actions(message)
+
+        self.assertEqual(events[0], "delete")
+        self.assertEqual(set(events[1:3]), {"dm start", "timeout start"})
+        self.assertEqual(set(events[3:]), {"dm end", "timeout end"})
+        self.assertEqual(in_flight[1], 2)
+        self.assertEqual((deleted, timed_out, dm_sent), (True, True, False))
+        self.assertEqual(errors, ["Could not DM the user."])
+
+    async def test_build_scan_result_records_part_sources(self):
+        class FakeDetector(DoxxingDetector):
+            async def ocr_attachment_text(self, attachment, guild=None, priority=0):
+                return "ocr text"
+
+        detector = FakeDetector(SimpleNamespace())
+        message = SimpleNamespace(
+            content="hello",
+            embeds=[SimpleNamespace(title="embed title", description="", fields=[])],
+            attachments=[SimpleNamespace(filename="pic.png", content_type="image/png")],
+            message_snapshots=[SimpleNamespace(message=SimpleNamespace(content="forwarded", embeds=[], attachments=[]))],
+            reference=None,
+            guild=None,
+        )
+
+        scan_result = await detector.build_scan_result(message)
+
+        self.assertEqual(
+            [source for source, _text in scan_result.parts],
+            ["content", "embed", "attachment", "ocr", "snapshot"],
+        )
+        self.assertEqual(scan_result.sources, ["content", "embed", "attachment", "ocr", "snapshot"])
+        self.assertIn("ocr text", scan_result.content)
+        self.assertIn("ocr and fetch", scan_result.timings)
+
+    async def test_on_message_logs_scan_result_without_rescanning(self):
+        sent_embeds = []
+
+        async def send_log(embed):
+            sent_embeds.append(embed)
+
+        async def send_dm(content):
+            pass
+
+        async def delete_message():
+            pass
+
+        class FakeDetector(DoxxingDetector):
+            async def build_scan_result(self, message, stop_on_match=False):
+                self.scan_calls += 1
+                return await super().build_scan_result(message, stop_on_match)
+
+        log_channel = SimpleNamespace(send=send_log)
+        guild = SimpleNamespace(
+            get_channel=lambda channel_id: log_channel,
+            get_member=lambda member_id: None,
+            me=None,
+        )
+        bot = SimpleNamespace(get_channel=lambda channel_id: log_channel, user=SimpleNamespace(id=999))
+        detector = FakeDetector(bot)
+        detector.scan_calls = 0
+        message = SimpleNamespace(
+            guild=guild,
+            author=SimpleNamespace(bot=False, mention="@user", id=321, send=send_dm),
+            channel=SimpleNamespace(id=456, mention="#general"),
+            content="my number is 555-123-4567",
+            embeds=[],
+            attachments=[],
+            message_snapshots=[],
+            reference=None,
+            delete=delete_message,
+        )
+
+        with mock.patch.object(discord, "Member", SimpleNamespace):
+            await detector.on_message(message)
+
+        self.assertEqual(detector.scan_calls, 1)
+        fields = {field.name: field.value for field in sent_embeds[-1].fields}
+        self.assertEqual(fields["Detected"], "phone number")
+        self.assertIn("555-123-4567", fields["Message"])
+        self.assertEqual(fields["Scanned"], "content")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+import io
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from doxxing_detector.replay import main, numbered_batches, replay, summary_text
+
+
+DUMP_LINES = [
+    json.dumps({"id": 1, "content": "email me at person@example.com"}),
+    json.dumps({"id": 2, "content": "the score was 3-2 and then 10-7"}),
+    "",
+    "{not json",
+    json.dumps(
+        {
+            "id": 3,
+            "content": "",
+            "message_snapshots": [{"message": {"content": "", "embeds": [{"description": "call 555-013-4567"}]}}],
+        }
+    ),
+]
+
+
+class ReplayTest(unittest.TestCase):
+    def test_replay_writes_verdicts_in_order_and_counts_matches(self):
+        output = io.StringIO()
+
+        counts = replay(iter(DUMP_LINES), output)
+
+        verdicts = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([verdict["line"] for verdict in verdicts], [1, 2, 4, 5])
+        self.assertEqual(verdicts[0]["types"], ["email"])
+        self.assertEqual(verdicts[1]["types"], [])
+        self.assertIn("Invalid JSON", verdicts[2]["error"])
+        self.assertEqual(verdicts[3]["types"], ["phone number"])
+        self.assertEqual((counts["messages"], counts["matched"], counts["errors"]), (3, 2, 1))
+        self.assertIn("Matched email: 1", summary_text(counts))
+
+    def test_replay_process_pool_matches_in_process_results(self):
+        lines = DUMP_LINES * 20
+        in_process = io.StringIO()
+        pooled = io.StringIO()
+
+        replay(iter(lines), in_process)
+        replay(iter(lines), pooled, workers=2, batch_size=7)
+
+        self.assertEqual(pooled.getvalue(), in_process.getvalue())
+
+    def test_numbered_batches_reads_lazily(self):
+        read = []
+
+        def lines():
+            for line in ["a", "b", "c", "d", "e"]:
+                read.append(line)
+                yield line
+
+        batches = numbered_batches(lines(), 2)
+
+        self.assertEqual(next(batches), [(1, "a"), (2, "b")])
+        self.assertLessEqual(len(read), 3)
+
+    def test_only_matches_skips_clean_verdicts(self):
+        output = io.StringIO()
+
+        replay(iter(DUMP_LINES), output, only_matches=True)
+
+        self.assertEqual([json.loads(line)["line"] for line in output.getvalue().splitlines()], [1, 4, 5])
+
+    def test_main_reads_dump_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            dump_path = f"{directory}/dump.jsonl"
+            output_path = f"{directory}/verdicts.jsonl"
+            with open(dump_path, "w", encoding="utf-8") as dump:
+                dump.write("\n".join(DUMP_LINES) + "\n")
+
+            with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                exit_code = main([dump_path, "--output", output_path, "--workers", "0"])
+
+            with open(output_path, encoding="utf-8") as verdicts:
+                self.assertEqual(len(verdicts.readlines()), 4)
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Messages matched: 2", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()